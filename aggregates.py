@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Persistent all-time aggregates (analytics/aggregates.json)
+Each nightly run folds in only that day's delta; README, dashboard and commit message render from it
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+
+from build_cache import atomic_write
+from settlement import format_pnl
+
+EDGE_ROWS = (
+    ('late_window_lock', 'Late-Window Lock'),
+    ('speed_advantage', 'Speed Advantage'),
+    ('volatility_mispricing', 'Volatility Mispricing'),
+)
+COUNTERS = ('cycles', 'signals', 'skips', 'trades', 'wins', 'losses', 'pending',
+            'confidence_wins_sum', 'confidence_wins_count',
+            'confidence_losses_sum', 'confidence_losses_count')
+README_START = "<!-- dashboard:start -->"
+README_END = "<!-- dashboard:end -->"
+
+def _empty_edge():
+    return {"trades": 0, "wins": 0, "losses": 0, "pnl": 0.0}
+
+def empty_store():
+    totals = {key: 0 for key in COUNTERS}
+    totals.update({"pnl": 0.0, "best_trade": None, "worst_trade": None})
+    return {"first_date": None, "last_date": None, "totals": totals, "by_edge": {}, "days": {}}
+
+def load_store(path):
+    """Load the aggregates store, or an empty one"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return empty_store()
+
+class StoreCache:
+    """load_store() for long-running callers; the file is re-read only when its mtime or size changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._stat = ()  # Never matches a real stat, so the first get() loads
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+            stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat = None
+        if stat != self._stat:
+            self._store = load_store(self.path)
+            self._stat = stat
+        return self._store
+
+def save_store(path, store):
+    """Persist atomically (temp file + rename); identical bytes are not rewritten"""
+    return atomic_write(path, json.dumps(store, indent=2, sort_keys=True))
+
+def day_delta(total_cycles, signals, trades, pnl):
+    """One day's contribution, from the DayContext numbers and its P/L summary"""
+    delta = {
+        "cycles": total_cycles,
+        "signals": signals,
+        "skips": total_cycles - signals,
+        "trades": len(trades),
+        "wins": pnl['wins'],
+        "losses": pnl['losses'],
+        "pending": pnl['pending'],
+        "pnl": pnl['total_pnl'],
+        "best_trade": pnl['best_trade'] if pnl['wins'] + pnl['losses'] else None,
+        "worst_trade": pnl['worst_trade'] if pnl['wins'] + pnl['losses'] else None,
+        "by_edge": {
+            edge: {key: stats[key] for key in ('trades', 'wins', 'losses', 'pnl')}
+            for edge, stats in pnl['by_edge'].items() if stats['trades']
+        },
+    }
+    for outcome in ('wins', 'losses'):
+        delta[f"confidence_{outcome}_sum"] = 0.0
+        delta[f"confidence_{outcome}_count"] = 0
+    for trade in trades:
+        outcome, confidence = _trade_confidence(trade)
+        if confidence is not None:
+            delta[f"confidence_{outcome}_sum"] += confidence
+            delta[f"confidence_{outcome}_count"] += 1
+    return delta
+
+def _trade_outcome(trade):
+    return 'wins' if trade.get('market_result') == trade.get('side') else 'losses'
+
+def _trade_confidence(trade):
+    """(outcome, confidence) of a settled trade; confidence is None if unsettled or not stated"""
+    if trade.get('pnl') is None:
+        return None, None
+    # Only reasoning templates like "(72% < 70% threshold)" carry a confidence; most BUY signals have none
+    return _trade_outcome(trade), trade.get('confidence', (trade.get('reasoning_fields') or {}).get('confidence'))
+
+class RunningDelta:
+    """day_delta() kept current one trade at a time, for --follow
+
+    replace(old, new) swaps a trade's previous copy (None if it is new) for
+    its latest one, so a publish only touches trades that changed.
+    """
+
+    def __init__(self):
+        self.counts = {key: 0 for key in ('trades', 'wins', 'losses', 'pending')}
+        self.confidence = {f"confidence_{outcome}_{key}": initial for outcome in ('wins', 'losses')
+                           for key, initial in (('sum', 0.0), ('count', 0))}
+        self.pnl = 0.0
+        self.by_edge = {}
+        self.settled_pnl = Counter()  # pnl -> settled trades with it, for best/worst
+
+    def _apply(self, trade, sign):
+        edge = self.by_edge.setdefault(trade.get('edge_type', 'unknown'), _empty_edge())
+        self.counts['trades'] += sign
+        edge['trades'] += sign
+        pnl = trade.get('pnl')
+        if pnl is None:
+            self.counts['pending'] += sign
+            return
+        outcome = _trade_outcome(trade)
+        self.counts[outcome] += sign
+        edge[outcome] += sign
+        self.pnl = round(self.pnl + sign * pnl, 4)
+        edge['pnl'] = round(edge['pnl'] + sign * pnl, 4)
+        self.settled_pnl[pnl] += sign
+        if not self.settled_pnl[pnl]:
+            del self.settled_pnl[pnl]
+        _, confidence = _trade_confidence(trade)
+        if confidence is not None:
+            self.confidence[f"confidence_{outcome}_sum"] += sign * confidence
+            self.confidence[f"confidence_{outcome}_count"] += sign
+
+    def replace(self, old, new):
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+
+    def delta(self, total_cycles, signals):
+        """The same dict day_delta() would build from all of the day's trades"""
+        settled = self.counts['wins'] + self.counts['losses']
+        return {
+            "cycles": total_cycles,
+            "signals": signals,
+            "skips": total_cycles - signals,
+            **self.counts,
+            "pnl": self.pnl,
+            "best_trade": max(self.settled_pnl) if settled else None,
+            "worst_trade": min(self.settled_pnl) if settled else None,
+            "by_edge": {edge: dict(stats) for edge, stats in self.by_edge.items() if stats['trades']},
+            **self.confidence,
+        }
+
+def _add(store, delta, sign):
+    totals = store['totals']
+    for key in COUNTERS:
+        totals[key] += sign * delta.get(key, 0)
+    totals['pnl'] = round(totals['pnl'] + sign * delta['pnl'], 4)
+    for edge, stats in delta['by_edge'].items():
+        edge_totals = store['by_edge'].setdefault(edge, _empty_edge())
+        for key in ('trades', 'wins', 'losses'):
+            edge_totals[key] += sign * stats[key]
+        edge_totals['pnl'] = round(edge_totals['pnl'] + sign * stats['pnl'], 4)
+
+def _extremes(store):
+    """Recompute best/worst from per-day values (only needed when a day is replaced)"""
+    bests = [d['best_trade'] for d in store['days'].values() if d['best_trade'] is not None]
+    worsts = [d['worst_trade'] for d in store['days'].values() if d['worst_trade'] is not None]
+    store['totals']['best_trade'] = max(bests) if bests else None
+    store['totals']['worst_trade'] = min(worsts) if worsts else None
+
+def apply_day(store, target_date, delta):
+    """Fold one day into the store; re-applying a date replaces its previous delta"""
+    previous = store['days'].get(target_date)
+    if previous == delta:
+        return store  # Re-run with identical numbers; keep updated_at so the file is unchanged
+    if previous is not None:
+        _add(store, previous, -1)
+    _add(store, delta, 1)
+    store['days'][target_date] = delta
+
+    totals = store['totals']
+    if previous is not None:
+        _extremes(store)
+    else:
+        if delta['best_trade'] is not None:
+            totals['best_trade'] = max(delta['best_trade'], totals['best_trade'] if totals['best_trade'] is not None else delta['best_trade'])
+        if delta['worst_trade'] is not None:
+            totals['worst_trade'] = min(delta['worst_trade'], totals['worst_trade'] if totals['worst_trade'] is not None else delta['worst_trade'])
+
+    store['first_date'] = min(filter(None, (store['first_date'], target_date)))
+    store['last_date'] = max(filter(None, (store['last_date'], target_date)))
+    store['updated_at'] = datetime.now().isoformat()
+    return store
+
+def _pct(numerator, denominator):
+    return f"{numerator / denominator * 100:.1f}%" if denominator else "--%"
+
+def _avg_confidence(total, count):
+    """Average confidence as a percentage; accepts 0-1 or 0-100 inputs"""
+    if not count:
+        return "--%"
+    average = total / count
+    return f"{average * 100 if average <= 1 else average:.1f}%"
+
+def headline(store):
+    """All-time numbers as display strings, shared by README, dashboard and commit message"""
+    totals = store['totals']
+    settled = totals['wins'] + totals['losses']
+    return {
+        "start_date": store['first_date'] or '--',
+        "total_cycles": totals['cycles'],
+        "total_trades": totals['trades'],
+        "win_rate": _pct(totals['wins'], settled),
+        "total_pnl": format_pnl(totals['pnl']),
+        "best_trade": format_pnl(totals['best_trade']),
+        "worst_trade": format_pnl(totals['worst_trade']),
+        "skip_rate": _pct(totals['skips'], totals['cycles']),
+        "avg_conf_wins": _avg_confidence(totals['confidence_wins_sum'], totals['confidence_wins_count']),
+        "avg_conf_losses": _avg_confidence(totals['confidence_losses_sum'], totals['confidence_losses_count']),
+    }
+
+def edge_rows(store):
+    """[(label, trades, wins, losses, win_rate, pnl)] for the edge table"""
+    rows = []
+    for edge, label in EDGE_ROWS:
+        stats = store['by_edge'].get(edge, _empty_edge())
+        rows.append((label, stats['trades'], stats['wins'], stats['losses'],
+                     _pct(stats['wins'], stats['wins'] + stats['losses']), format_pnl(stats['pnl'])))
+    return rows
+
+def render_readme_dashboard(store):
+    """Markdown for the README's Performance Dashboard and Edge Performance tables"""
+    h = headline(store)
+    lines = [
+        "| Metric | Value |",
+        "|--------|-------|",
+        f"| Start Date | {h['start_date']} |",
+        f"| Total Cycles Monitored | {h['total_cycles']} |",
+        f"| Total Trades Executed | {h['total_trades']} |",
+        f"| Win Rate | {h['win_rate']} |",
+        f"| Total P/L | {h['total_pnl']} |",
+        f"| Best Single Trade | {h['best_trade']} |",
+        f"| Worst Single Trade | {h['worst_trade']} |",
+        f"| Skip Rate | {h['skip_rate']} |",
+        f"| Avg Claude Confidence on Wins | {h['avg_conf_wins']} |",
+        f"| Avg Claude Confidence on Losses | {h['avg_conf_losses']} |",
+        "",
+        "## Edge Performance",
+        "",
+        "| Edge Type | Trades | Wins | Losses | Win Rate | Total P/L |",
+        "|-----------|--------|------|--------|----------|-----------|",
+    ]
+    for label, trades, wins, losses, win_rate, pnl in edge_rows(store):
+        lines.append(f"| {label} | {trades} | {wins} | {losses} | {win_rate} | {pnl} |")
+    return "\n".join(lines)
+
+def update_readme(readme_path, store):
+    """Splice the rendered tables between the README dashboard markers and stamp the time
+    
+    Returns False without touching the file when the tables are unchanged.
+    """
+    with open(readme_path, 'r') as f:
+        content = f.read()
+
+    start = content.find(README_START)
+    end = content.find(README_END)
+    if start == -1 or end == -1:
+        raise ValueError(f"README dashboard markers not found in {readme_path}")
+
+    updated = (content[:start + len(README_START)] + "\n" + render_readme_dashboard(store) +
+               "\n" + content[end:])
+    if updated == content:
+        return False  # Same numbers; leave the timestamp alone so git sees no change
+    content = re.sub(r'^Last updated: .*$', f"Last updated: {datetime.now().isoformat()}",
+                     updated, flags=re.MULTILINE)
+    return atomic_write(readme_path, content)
+
+def commit_summary(store):
+    """Short all-time tail for the nightly commit message"""
+    h = headline(store)
+    return f"All-time: {h['total_trades']} trades, {h['win_rate']} win rate, {h['total_pnl']}"
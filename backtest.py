@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Event-replay backtester over archived cycles (cycles/{date}_cycles.kcc)
+Streams cycles through a decision rule, simulates fills/positions/settlement and sweeps parameter grids
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from cycle_archive import archived_dates, load_day_columns, load_day_cycles
+from cycle_record import Cycle
+from edge_classifier import classify, classify_column
+from nightly_github_update import SETTLEMENTS_FILE, load_thresholds
+from positions import DEFAULT_POSITION_SIZE_MAX, FILL_SIZE, PositionBook
+from settlement import EDGE_TYPES, format_pnl, load_settlements
+
+try:
+    import numpy as np
+except ImportError:  # Optional: every configuration falls back to the streaming replay
+    np = None
+
+DEFAULT_CHEAP_THRESHOLD = 0.35  # The "YES cheap at $X (threshold: $0.35)" rule
+DEFAULT_CONFIDENCE_THRESHOLD = 0.70
+SETTLE_INFER_MINUTES = 1.0  # A window's last quote this close to expiry ...
+SETTLE_INFER_CENTS = 95  # ... at or above this ask decides an otherwise unsettled window
+COLUMNS = ('market_ticker', 'close_time', 'yes_ask', 'no_ask', 'time_remaining', 'outcome', 'reasoning')
+
+def current_params():
+    """The live configuration from config/current_thresholds.json"""
+    thresholds = load_thresholds()
+    return {
+        "cheap_threshold": thresholds.get('cheap_threshold', DEFAULT_CHEAP_THRESHOLD),
+        "confidence_threshold": thresholds.get('confidence_threshold', DEFAULT_CONFIDENCE_THRESHOLD),
+        "position_size_max": thresholds.get('position_size_max', DEFAULT_POSITION_SIZE_MAX),
+        "edges_enabled": tuple(thresholds.get('edges_enabled', EDGE_TYPES[:-1])),
+    }
+
+def cheap_side_rule(cycle, params, edge_type, fields):
+    """Buy the cheaper side when its ask is at or under cheap_threshold
+
+    Cycles whose reasoning reports a confidence below confidence_threshold,
+    or carries an edge tag that is not in edges_enabled, are skipped. A
+    decision rule returns 'BUY_YES', 'BUY_NO' or None.
+    """
+    confidence = fields.get('confidence')
+    if confidence is not None and confidence < round(params['confidence_threshold'] * 100, 6):
+        return None
+    if edge_type != 'unknown' and edge_type not in params['edges_enabled']:
+        return None
+    side, ask = ('YES', cycle.yes_ask) if cycle.yes_ask <= cycle.no_ask else ('NO', cycle.no_ask)
+    if 0 < ask < 100 and ask <= round(params['cheap_threshold'] * 100):
+        return f"BUY_{side}"
+    return None
+
+def _window_result(settlements, key, logged, last):
+    """'yes' / 'no' / None for one market window
+
+    The settlement table wins, then an outcome the bot logged, then the last
+    quote seen if it was taken within SETTLE_INFER_MINUTES of expiry at a
+    decisive price.
+    """
+    result = settlements.get(key) or (logged or '').lower() or None
+    if result in ('yes', 'no'):
+        return result
+    if last is not None and last.time_remaining <= SETTLE_INFER_MINUTES:
+        if last.yes_ask >= SETTLE_INFER_CENTS:
+            return 'yes'
+        if last.no_ask >= SETTLE_INFER_CENTS:
+            return 'no'
+    return None
+
+def _empty_result(params):
+    return {
+        "params": params, "positions": 0, "fills": 0, "contracts": 0.0,
+        "wins": 0, "losses": 0, "pending": 0, "cost": 0.0, "pnl": 0.0, "win_rate": 0.0
+    }
+
+def _finish(result):
+    settled = result['wins'] + result['losses']
+    result['win_rate'] = round(result['wins'] / settled * 100, 2) if settled else 0.0
+    result['pnl'] = round(result['pnl'], 4)
+    result['cost'] = round(result['cost'], 4)
+    result['contracts'] = round(result['contracts'], 4)
+    return result
+
+def replay(cycles_dir, dates, params, decide=cheap_side_rule, settlements=None):
+    """Stream archived days through decide() one cycle at a time; returns the result dict
+
+    Works with any decision rule. Positions fold exactly like the live
+    pipeline (PositionBook) and are settled once the whole range is read.
+    """
+    settlements = settlements or {}
+    book = PositionBook(params['position_size_max'])
+    last_quote, logged = {}, {}
+    for target_date in dates:
+        for cycle in load_day_cycles(cycles_dir, target_date):
+            key = (cycle.market_ticker, cycle.close_time)
+            last_quote[key] = cycle
+            if cycle.outcome:
+                logged[key] = cycle.outcome
+            edge_type, _, fields = classify(cycle.reasoning)
+            decision = decide(cycle, params, edge_type, fields)
+            if decision:
+                simulated = Cycle(**{name: getattr(cycle, name) for name in Cycle.__slots__})
+                simulated.decision = decision
+                book.add(simulated)
+
+    result = _empty_result(params)
+    for position in book.positions:
+        key = (position.market_ticker, position.close_time)
+        outcome = _window_result(settlements, key, logged.get(key), last_quote.get(key))
+        result['positions'] += 1
+        result['fills'] += position.fills
+        result['contracts'] += position.size
+        result['cost'] += position.cost_cents / 100
+        if outcome is None:
+            result['pending'] += 1
+        elif outcome == position.side:
+            result['wins'] += 1
+            result['pnl'] += (position.size * 100 - position.cost_cents) / 100
+        else:
+            result['losses'] += 1
+            result['pnl'] -= position.cost_cents / 100
+    return _finish(result)
+
+class ReplayColumns:
+    """Archived days as NumPy arrays, loaded once and shared by every configuration"""
+
+    def __init__(self, cycles_dir, dates, settlements=None):
+        settlements = settlements or {}
+        windows, window_ids = [], {}
+        window, yes_ask, no_ask, confidence, edge = [], [], [], [], []
+        last_quote, logged = {}, {}
+        for target_date in dates:
+            columns = load_day_columns(cycles_dir, target_date, COLUMNS)
+            if not columns:
+                continue
+            classified = classify_column(columns['reasoning'])
+            confidence.extend(classified.get('confidence') or [None] * len(columns['reasoning']))
+            edge.extend(EDGE_TYPES.index(e) if e in EDGE_TYPES else len(EDGE_TYPES) - 1
+                        for e in classified['edge_type'])
+            last_row = {}
+            for row, key in enumerate(zip(columns['market_ticker'], columns['close_time'])):
+                window_id = window_ids.get(key)
+                if window_id is None:
+                    window_id = window_ids[key] = len(windows)
+                    windows.append(key)
+                window.append(window_id)
+                last_row[key] = row
+                if columns['outcome'][row]:
+                    logged[key] = columns['outcome'][row]
+            for key, row in last_row.items():
+                last_quote[key] = Cycle(time_remaining=columns['time_remaining'][row],
+                                        yes_ask=columns['yes_ask'][row], no_ask=columns['no_ask'][row])
+            yes_ask.extend(columns['yes_ask'])
+            no_ask.extend(columns['no_ask'])
+
+        self.rows = len(window)
+        self.window = np.array(window, dtype=np.int64)
+        self.yes_ask = np.array(yes_ask, dtype=np.int64)
+        self.no_ask = np.array(no_ask, dtype=np.int64)
+        self.confidence = np.array([np.nan if c is None else c for c in confidence], dtype=float)
+        self.edge = np.array(edge, dtype=np.int64)
+        # Window outcome: 1 = yes, 0 = no, -1 = unsettled
+        outcome_codes = {'yes': 1, 'no': 0, None: -1}
+        self.outcome = np.array([
+            outcome_codes[_window_result(settlements, key, logged.get(key), last_quote.get(key))]
+            for key in windows
+        ], dtype=np.int64)
+        self.side_yes = self.yes_ask <= self.no_ask
+        self.entry = np.where(self.side_yes, self.yes_ask, self.no_ask)
+
+    def evaluate(self, params):
+        """cheap_side_rule for every cycle at once; same numbers as replay()"""
+        result = _empty_result(params)
+        allowed = [i for i, e in enumerate(EDGE_TYPES) if e == 'unknown' or e in params['edges_enabled']]
+        cheap = round(params['cheap_threshold'] * 100)
+        mask = (self.entry > 0) & (self.entry < 100) & (self.entry <= cheap)
+        mask &= np.isnan(self.confidence) | (self.confidence >= round(params['confidence_threshold'] * 100, 6))
+        mask &= np.isin(self.edge, allowed)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return _finish(result)
+
+        # Group signals by window (stable, so time order is kept) and split on side flips
+        rows = rows[np.argsort(self.window[rows], kind='stable')]
+        window = self.window[rows]
+        side_yes = self.side_yes[rows]
+        entry = self.entry[rows]
+        starts = np.ones(len(rows), dtype=bool)
+        starts[1:] = (window[1:] != window[:-1]) | (side_yes[1:] != side_yes[:-1])
+        position = np.cumsum(starts) - 1
+        rank = np.arange(len(rows)) - np.flatnonzero(starts)[position]
+        fill = np.clip(params['position_size_max'] - rank * FILL_SIZE, 0, FILL_SIZE)
+
+        size = np.bincount(position, weights=fill)
+        cost = np.bincount(position, weights=fill * entry)
+        outcome = self.outcome[window[starts]]
+        settled = outcome >= 0
+        won = settled & (outcome == side_yes[starts])
+        pnl = np.where(won, size * 100 - cost, -cost)
+
+        result['positions'] = int(starts.sum())
+        result['fills'] = int((fill > 0).sum())
+        result['contracts'] = float(size.sum())
+        result['cost'] = float(cost.sum()) / 100
+        result['wins'] = int(won.sum())
+        result['losses'] = int((settled & ~won).sum())
+        result['pending'] = int((~settled).sum())
+        result['pnl'] = float(pnl[settled].sum()) / 100
+        return _finish(result)
+
+# Per-process state for the grid workers
+_worker = {}
+
+def _init_worker(cycles_dir, dates, settlements, decide):
+    _worker.update(cycles_dir=cycles_dir, dates=dates, settlements=settlements, decide=decide)
+    if decide is cheap_side_rule and np is not None:
+        _worker['columns'] = ReplayColumns(cycles_dir, dates, settlements)
+
+def _run_chunk(configs):
+    columns = _worker.get('columns')
+    if columns is not None:
+        return [columns.evaluate(params) for params in configs]
+    return [replay(_worker['cycles_dir'], _worker['dates'], params, _worker['decide'], _worker['settlements'])
+            for params in configs]
+
+def expand_grid(grid):
+    """{'cheap_threshold': [0.3, 0.35], ...} -> one params dict per combination"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def run_grid(cycles_dir, dates, configs, decide=cheap_side_rule, settlements=None, workers=None):
+    """Evaluate every configuration; results come back in configs order
+
+    Configurations are split into one chunk per worker so each process loads
+    the archive once. decide must be a module-level function (it is pickled).
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(configs)))
+    if workers == 1:
+        _init_worker(cycles_dir, dates, settlements, decide)
+        return _run_chunk(configs)
+    chunks = [configs[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cycles_dir, dates, settlements, decide)) as pool:
+        chunk_results = list(pool.map(_run_chunk, chunks))
+    results = [None] * len(configs)
+    for i, chunk in enumerate(chunk_results):
+        results[i::workers] = chunk
+    return results
+
+def _parse_values(text, cast=float):
+    """'0.25,0.30' or an inclusive 'start:stop:step' range"""
+    if ':' in text:
+        start, stop, step = (cast(part) for part in text.split(':'))
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [cast(part) for part in text.split(',')]
+
+def _parse_edges(text):
+    """'late_window_lock+speed_advantage,all' -> [(...), (...)]"""
+    options = []
+    for option in text.split(','):
+        if option == 'all':
+            options.append(EDGE_TYPES[:-1])
+        elif option == 'none':
+            options.append(())
+        else:
+            options.append(tuple(option.split('+')))
+    return options
+
+def _load_rule(spec):
+    """'module:function' -> the decision function"""
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name or 'decide')
+
+def _describe(params):
+    edges = '+'.join(e.split('_')[0] for e in params['edges_enabled']) or 'none'
+    return (f"cheap ≤ ${params['cheap_threshold']:.2f}  conf ≥ {params['confidence_threshold']:.2f}  "
+            f"size ≤ {params['position_size_max']:g}  edges {edges}")
+
+def main():
+    """Replay archived days across a parameter grid and rank the configurations"""
+    live = current_params()
+    parser = argparse.ArgumentParser(description="Replay archived cycles under different thresholds")
+    parser.add_argument('--cycles-dir', default='cycles')
+    parser.add_argument('--days', type=int, default=30, help='Most recent archived days to replay')
+    parser.add_argument('--from', dest='from_date')
+    parser.add_argument('--to', dest='to_date')
+    parser.add_argument('--cheap-threshold', default=str(live['cheap_threshold']),
+                        help="Dollars, e.g. 0.30,0.35 or 0.20:0.40:0.01")
+    parser.add_argument('--confidence-threshold', default=str(live['confidence_threshold']))
+    parser.add_argument('--size-max', default=str(live['position_size_max']))
+    parser.add_argument('--edges', default='+'.join(live['edges_enabled']) or 'none',
+                        help="Comma-separated options, each 'all', 'none' or edge+edge")
+    parser.add_argument('--rule', help='Decision function as module:function (default: cheap-side rule)')
+    parser.add_argument('--settlements', default=SETTLEMENTS_FILE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--out', help='Write every result as JSON')
+    args = parser.parse_args()
+
+    dates = archived_dates(args.cycles_dir)
+    if args.from_date:
+        dates = [d for d in dates if d >= args.from_date]
+    if args.to_date:
+        dates = [d for d in dates if d <= args.to_date]
+    if not (args.from_date or args.to_date):
+        dates = dates[-args.days:]
+    if not dates:
+        print(f"❌ No archived days in {args.cycles_dir}/")
+        return
+
+    grid = {
+        "cheap_threshold": _parse_values(args.cheap_threshold),
+        "confidence_threshold": _parse_values(args.confidence_threshold),
+        "position_size_max": _parse_values(args.size_max),
+        "edges_enabled": _parse_edges(args.edges),
+    }
+    configs = expand_grid(grid)
+    decide = _load_rule(args.rule) if args.rule else cheap_side_rule
+    settlements = load_settlements(args.settlements)
+    mode = 'vectorized' if decide is cheap_side_rule and np is not None else 'streaming'
+    print(f"🔁 Replaying {dates[0]} to {dates[-1]} ({len(dates)} days), "
+          f"{len(configs)} configuration(s), {mode}, {args.workers} worker(s)")
+
+    started = time.perf_counter()
+    results = run_grid(args.cycles_dir, dates, configs, decide, settlements, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Done in {elapsed:.2f}s")
+
+    ranked = sorted(results, key=lambda r: r['pnl'], reverse=True)
+    print(f"\n{'P/L':>10} {'Win%':>6} {'Pos':>6} {'Pend':>5}  Configuration")
+    for result in ranked[:args.top]:
+        marker = ' ◀ live' if result['params'] == live else ''
+        print(f"{format_pnl(result['pnl']):>10} {result['win_rate']:6.1f} {result['positions']:6d} "
+              f"{result['pending']:5d}  {_describe(result['params'])}{marker}")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({
+                "generated_at": datetime.now().isoformat(),
+                "dates": [dates[0], dates[-1]],
+                "elapsed_s": round(elapsed, 3),
+                "results": results
+            }, f, indent=2)
+        print(f"💾 Results saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full json.loads scan vs mmap byte prefilter on btc_cycle_log.jsonl
+Builds a synthetic multi-gigabyte log and times pulling one day out of it
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from cycle_log import open_mapped, scan_cycles_for_date
+from synthetic_cycles import write_synthetic_log
+
+def legacy_scan(path, target_date):
+    """The original get_todays_cycles loop: json.loads on every line"""
+    cycles = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                cycle = json.loads(line.strip())
+                if cycle.get('timestamp', '')[:10] == target_date:
+                    cycles.append(cycle)
+            except:
+                continue
+    return cycles
+
+def mmap_scan(path, target_date):
+    """Byte-level prefilter over the mapped file"""
+    with open_mapped(path) as mm:
+        return scan_cycles_for_date(mm, target_date) if mm is not None else []
+
+def time_call(fn, *args):
+    """Return (seconds, result) for one call"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+def main():
+    """Generate (or reuse) a log and time both scanners on one day"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=int, default=2048, help='Synthetic log size (default 2 GB)')
+    parser.add_argument('--log', help='Reuse an existing log instead of generating one')
+    parser.add_argument('--date', help='Day to extract (default: last day in the synthetic log)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the mmap scanner')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.log
+    target_date = args.date
+    if not path:
+        tmp_dir = tempfile.mkdtemp(prefix='cycle_bench_')
+        path = os.path.join(tmp_dir, 'btc_cycle_log.jsonl')
+        print(f"🛠️ Writing {args.size_mb} MB synthetic log to {path}...")
+        last_date, _ = write_synthetic_log(path, '2025-01-01', max_bytes=args.size_mb * 1024 * 1024)
+        target_date = target_date or last_date
+    if not target_date:
+        parser.error('--date is required with --log')
+
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    print(f"📏 Log size: {size_mb:.0f} MB, extracting {target_date}")
+
+    try:
+        mmap_seconds, mmap_cycles = time_call(mmap_scan, path, target_date)
+        print(f"⚡ mmap prefilter: {mmap_seconds:.2f}s ({len(mmap_cycles)} cycles)")
+
+        if not args.skip_legacy:
+            legacy_seconds, legacy_cycles = time_call(legacy_scan, path, target_date)
+            print(f"🐢 legacy json scan: {legacy_seconds:.2f}s ({len(legacy_cycles)} cycles)")
+            if legacy_cycles != mmap_cycles:
+                print("❌ Results differ between scanners")
+            print(f"🎯 Speedup: {legacy_seconds / mmap_seconds:.1f}x")
+    finally:
+        if tmp_dir:
+            os.remove(path)
+            os.rmdir(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark: nightly pipeline stages against 1 day, 30 days and 1 year of synthetic log
+Results are written as JSON so runs can be compared for regressions
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, date, timedelta
+
+import nightly_github_update as nightly
+from cycle_record import Cycle
+from generate_dashboard import generate_dashboard_html
+from positions import DEFAULT_POSITION_SIZE_MAX
+from synthetic_cycles import DEFAULT_BUY_RATIO, write_synthetic_log
+from update_dashboard_with_data import update_dashboard_data
+
+DEFAULT_SCALES = (1, 30, 365)
+RESULTS_DIR = "benchmarks"
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def time_stage(fn, repeat, before=None):
+    """Run fn repeat times (stdout silenced); returns (timings, last result)"""
+    timings = []
+    result = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            if before:
+                before()
+            started = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - started)
+    return timings, result
+
+def _stats(timings):
+    return {
+        "min": round(min(timings), 6),
+        "median": round(statistics.median(timings), 6),
+        "runs": [round(t, 6) for t in timings]
+    }
+
+def bench_scale(work_dir, days, end_date, repeat, buy_ratio, seed):
+    """Generate a `days`-long log ending on end_date and time every stage on its last day"""
+    log_path = os.path.join(work_dir, f"btc_cycle_log_{days}d.jsonl")
+    checkpoint_path = f"{log_path}.checkpoint.json"
+    site_path = os.path.join(work_dir, f"site_{days}d")
+    os.makedirs(site_path, exist_ok=True)
+
+    start = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    print(f"🛠️ {days}d: writing synthetic log {start} to {end_date}...")
+    generated = time.perf_counter()
+    _, lines = write_synthetic_log(log_path, start, days=days, buy_ratio=buy_ratio, seed=seed)
+    generated = time.perf_counter() - generated
+
+    nightly.CYCLE_LOG_FILE = log_path
+    nightly.CHECKPOINT_FILE = checkpoint_path
+
+    def cold_checkpoint():
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    stages = {}
+    timings, cycle_data = time_stage(lambda: nightly.get_todays_cycles(end_date), repeat, cold_checkpoint)
+    stages['get_todays_cycles'] = _stats(timings)
+    timings, _ = time_stage(lambda: nightly.get_todays_cycles(end_date), repeat)
+    stages['get_todays_cycles_checkpointed'] = _stats(timings)
+    timings, trades = time_stage(lambda: nightly.get_todays_trades(end_date), repeat, cold_checkpoint)
+    stages['get_todays_trades'] = _stats(timings)
+
+    cycles = [Cycle.from_dict(c) for c in cycle_data['cycles']]
+    ctx = nightly.make_day_context(end_date, cycles, DEFAULT_POSITION_SIZE_MAX, settlements={})
+    timings, _ = time_stage(lambda: nightly.generate_daily_report(ctx), repeat)
+    stages['generate_daily_report'] = _stats(timings)
+    dashboard_data = ctx.cycle_data
+    timings, _ = time_stage(lambda: generate_dashboard_html(dashboard_data, ctx.trades), repeat)
+    stages['generate_dashboard_html'] = _stats(timings)
+    timings, _ = time_stage(lambda: update_dashboard_data(dashboard_data, ctx.trades, site_path=site_path), repeat)
+    stages['update_dashboard_data'] = _stats(timings)
+
+    result = {
+        "days": days,
+        "log_lines": lines,
+        "log_bytes": os.path.getsize(log_path),
+        "generate_seconds": round(generated, 3),
+        "day_cycles": len(cycles),
+        "day_trades": len(trades),
+        "stages": stages
+    }
+    os.remove(log_path)
+    cold_checkpoint()
+    return result
+
+def compare(current, baseline):
+    """Print the median change per stage against an earlier results file"""
+    print(f"\n📊 Compared with {baseline.get('git_commit') or '?'} ({baseline.get('generated_at', '?')[:19]})")
+    for scale, result in current['results'].items():
+        previous = baseline.get('results', {}).get(scale)
+        if not previous:
+            continue
+        for stage, stats in result['stages'].items():
+            before = previous['stages'].get(stage)
+            if not before or not before['median']:
+                continue
+            change = (stats['median'] - before['median']) / before['median'] * 100
+            flag = '⚠️' if change > 10 else '  '
+            print(f"{flag} {scale:>5} {stage:32s} {before['median']:.4f}s -> {stats['median']:.4f}s ({change:+.1f}%)")
+
+def main():
+    """Run the stage benchmarks and save a results JSON"""
+    parser = argparse.ArgumentParser(description="Nightly pipeline benchmarks on synthetic logs")
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma-separated log lengths in days (default 1,30,365)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--buy-ratio', type=float, default=DEFAULT_BUY_RATIO)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help=f'Results file (default {RESULTS_DIR}/pipeline_<timestamp>.json)')
+    parser.add_argument('--compare', help='Earlier results file to diff against')
+    args = parser.parse_args()
+
+    # The last day is today so get_todays_cycles takes the live (checkpoint) path
+    end_date = date.today().isoformat()
+    run = {
+        "generated_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"repeat": args.repeat, "buy_ratio": args.buy_ratio, "seed": args.seed, "end_date": end_date},
+        "results": {}
+    }
+
+    work_dir = tempfile.mkdtemp(prefix='pipeline_bench_')
+    try:
+        for days in (int(s) for s in args.scales.split(',')):
+            result = bench_scale(work_dir, days, end_date, args.repeat, args.buy_ratio, args.seed)
+            run['results'][f"{days}d"] = result
+            print(f"📏 {days}d: {result['log_bytes'] / 1024 / 1024:.0f} MB log, "
+                  f"{result['day_cycles']} cycles / {result['day_trades']} trades on the last day")
+            for stage, stats in result['stages'].items():
+                print(f"   {stage:32s} {stats['median']:.4f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"✅ Results saved to {out}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(run, json.load(f))
+
+if __name__ == "__main__":
+    main()
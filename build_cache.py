@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Content-hash build cache for generated files
+Each output records a hash of its inputs; unchanged outputs are neither re-rendered nor rewritten
+"""
+
+import hashlib
+import json
+import os
+
+BUILD_MANIFEST = ".build_cache.json"
+
+def fingerprint(*parts):
+    """Stable hash of JSON-able input parts (dicts are key-sorted)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(json.dumps(part, sort_keys=True, separators=(',', ':'), default=str).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def cycles_fingerprint(cycles):
+    """Hash of the Cycle fields any daily output depends on"""
+    digest = hashlib.sha256()
+    for c in cycles:
+        digest.update(
+            f"{c.cycle_id}|{c.timestamp}|{c.decision}|{c.yes_ask}|{c.no_ask}|{c.yes_bid}|{c.no_bid}|"
+            f"{c.time_remaining}|{c.outcome}|{c.would_profit}|{c.reasoning}\n".encode()
+        )
+    return digest.hexdigest()
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def _temp_path(path):
+    return f"{path}.tmp.{os.getpid()}"
+
+def atomic_write(path, data):
+    """Write str/bytes via temp file + rename, skipping the write if the bytes are identical
+
+    Returns True when the file changed.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = _temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+class AtomicOutput:
+    """Text file built in a temp file; only replaces the target on commit()"""
+
+    def __init__(self, cache, path, key):
+        self.cache = cache
+        self.path = path
+        self.key = key
+        self.tmp_path = _temp_path(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(self.tmp_path, 'w')
+
+    def commit(self):
+        """Move into place unless identical to the current file; returns True if it changed"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        new_hash = file_hash(self.tmp_path)
+        if new_hash == file_hash(self.path):
+            os.remove(self.tmp_path)
+            changed = False
+        else:
+            os.replace(self.tmp_path, self.path)
+            changed = True
+        self.cache.entries[self.path] = {"inputs": self.key, "output": new_hash}
+        return changed
+
+    def discard(self):
+        """Drop the partial output; the previous file stays untouched"""
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+class BuildCache:
+    """Manifest of {output path: {inputs, output}} hashes"""
+
+    def __init__(self, manifest_path=BUILD_MANIFEST):
+        self.manifest_path = manifest_path
+        try:
+            with open(manifest_path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def fresh(self, path, key):
+        """True if path was built from these inputs and has not been modified since"""
+        entry = self.entries.get(path)
+        return bool(entry) and entry['inputs'] == key and entry['output'] == file_hash(path)
+
+    def record(self, path, key):
+        """Note that path is now up to date for key (after writing it some other way)"""
+        self.entries[path] = {"inputs": key, "output": file_hash(path)}
+
+    def build(self, path, key, render):
+        """Regenerate path with render() -> str/bytes only when key changed; returns True if rewritten"""
+        if self.fresh(path, key):
+            return False
+        changed = atomic_write(path, render())
+        self.record(path, key)
+        return changed
+
+    def open(self, path, key):
+        """AtomicOutput for a streamed build, or None if path is already fresh"""
+        if self.fresh(path, key):
+            return None
+        return AtomicOutput(self, path, key)
+
+    def save(self):
+        atomic_write(self.manifest_path, json.dumps(self.entries, indent=2, sort_keys=True))
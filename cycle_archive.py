@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Columnar archive for daily cycle data (cycles/{date}_cycles.kcc)
+Replaces the indent=2 JSON dumps; old JSON files stay readable
+"""
+
+import base64
+import gzip
+import json
+import os
+import re
+import struct
+
+from build_cache import atomic_write
+from cycle_record import Cycle
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip is always available
+    zstandard = None
+
+MAGIC = b'KCC2\n'
+MAGIC_V1 = b'KCC1\n'  # Single block, no per-ticker deltas; still readable
+ARCHIVE_FORMAT = 2
+KEYFRAME_ROWS = 8192  # Rows per block; every ticker's first row in a block is stored in full
+ARCHIVE_SUFFIX = "_cycles.kcc"
+LEGACY_SUFFIX = "_cycles.json"
+
+# How each Cycle attribute is laid out on disk
+COLUMN_ENCODINGS = {
+    'timestamp': 'plain',
+    'unix_time': 'delta',
+    'market_ticker': 'dict',
+    'market_title': 'dict',
+    'yes_ask': 'plain',
+    'no_ask': 'plain',
+    'yes_bid': 'plain',
+    'no_bid': 'plain',
+    'time_remaining': 'plain',
+    'decision': 'dict',
+    'reasoning': 'template',
+    'close_time': 'dict',
+    'outcome': 'dict',
+    'would_profit': 'dict',
+    'cycle_id': 'cycle_id',
+}
+
+# Quotes are stored as per-ticker changes of their residual against a reference
+# quote: the YES ask itself, then YES spread, overround and NO spread
+QUOTE_REFERENCES = {
+    'yes_ask': None,
+    'yes_bid': 'yes_ask',
+    'no_ask': 'yes_ask',  # Against the complement 100 - yes_ask
+    'no_bid': 'no_ask',
+}
+
+# Columns stored only where they differ from the same ticker's previous row
+TICKER_DELTA_COLUMNS = ('reasoning',)
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+def default_compression():
+    return 'zstd' if zstandard is not None else 'gzip'
+
+def compress_blob(data, compression):
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return data
+
+def decompress_blob(data, compression):
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Archive is zstd-compressed but the zstandard module is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    return data
+
+def _split_template(text):
+    """'YES cheap at $0.0000 (threshold: $0.35)' -> ('YES cheap at ${} (threshold: ${})', ['0.0000', '0.35'])"""
+    escaped = text.replace('{', '{{').replace('}', '}}')
+    args = NUMBER_PATTERN.findall(escaped)
+    template = NUMBER_PATTERN.sub('{}', escaped)
+    return template, args
+
+def _encode_ticker_delta(encoding, values, tickers):
+    """Keep only values that changed since the same ticker's previous row
+
+    A bitmap marks the stored rows; the stored values get the column's usual
+    encoding. A ticker's first row in the block is always stored, so each
+    block decodes on its own.
+    """
+    bitmap = bytearray((len(values) + 7) // 8)
+    previous = {}
+    changed = []
+    for row, (ticker, value) in enumerate(zip(tickers, values)):
+        if ticker in previous and previous[ticker] == value:
+            continue
+        previous[ticker] = value
+        bitmap[row >> 3] |= 1 << (row & 7)
+        changed.append(value)
+    return {
+        "inner": encoding,
+        "changed": base64.b64encode(bytes(bitmap)).decode(),
+        "values": _encode_column(encoding, changed)
+    }
+
+def _quote_reference(name, reference_values, rows):
+    """Reference quote per row for a QUOTE_REFERENCES column"""
+    if QUOTE_REFERENCES[name] is None:
+        return [0] * rows
+    if name == 'no_ask':
+        return [100 - value for value in reference_values]
+    return reference_values
+
+def _encode_quote_delta(values, references, tickers):
+    """Per-ticker change of (quote - reference); unchanged quotes become 0"""
+    previous = {}
+    deltas = []
+    for ticker, value, reference in zip(tickers, values, references):
+        residual = value - reference
+        deltas.append(residual - previous.get(ticker, 0))
+        previous[ticker] = residual
+    return {"deltas": deltas}
+
+def _decode_quote_delta(payload, references, tickers):
+    """Inverse of _encode_quote_delta"""
+    previous = {}
+    values = []
+    for ticker, delta, reference in zip(tickers, payload['deltas'], references):
+        residual = previous[ticker] = previous.get(ticker, 0) + delta
+        values.append(residual + reference)
+    return values
+
+def _decode_ticker_delta(payload, tickers):
+    """Inverse of _encode_ticker_delta"""
+    bitmap = base64.b64decode(payload['changed'])
+    stored = iter(_decode_column(payload['inner'], payload['values']))
+    previous = {}
+    values = []
+    for row, ticker in enumerate(tickers):
+        if bitmap[row >> 3] >> (row & 7) & 1:
+            previous[ticker] = next(stored)
+        values.append(previous[ticker])
+    return values
+
+def _encode_column(encoding, values, tickers=None, unix_times=None):
+    """Encode one column's values into a JSON-able payload"""
+    if encoding == 'dict':
+        dictionary, lookup, codes = [], {}, []
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(dictionary)
+                dictionary.append(value)
+            codes.append(code)
+        return {"dictionary": dictionary, "codes": codes}
+
+    if encoding == 'delta':
+        deltas, previous = [], 0
+        for value in values:
+            deltas.append(value - previous)
+            previous = value
+        return {"deltas": deltas}
+
+    if encoding == 'template':
+        templates, lookup, codes, args = [], {}, [], []
+        for value in values:
+            template, row_args = _split_template(value)
+            if template.format(*row_args) != value:
+                template, row_args = value.replace('{', '{{').replace('}', '}}'), []
+            code = lookup.get(template)
+            if code is None:
+                code = lookup[template] = len(templates)
+                templates.append(template)
+            codes.append(code)
+            args.append(row_args)
+        return {"templates": templates, "codes": codes, "args": args}
+
+    if encoding == 'cycle_id':
+        # Normally '{ticker}_{unix_time}', so nothing needs storing
+        derived = [f"{t}_{u}" for t, u in zip(tickers, unix_times)]
+        if derived == list(values):
+            return {"derived": True}
+        return {"values": list(values)}
+
+    return {"values": list(values)}
+
+def _decode_column(encoding, payload, tickers=None, unix_times=None):
+    """Inverse of _encode_column"""
+    if encoding == 'dict':
+        dictionary = payload['dictionary']
+        return [dictionary[code] for code in payload['codes']]
+
+    if encoding == 'delta':
+        values, running = [], 0
+        for delta in payload['deltas']:
+            running += delta
+            values.append(running)
+        return values
+
+    if encoding == 'template':
+        templates = payload['templates']
+        return [templates[code].format(*args) for code, args in zip(payload['codes'], payload['args'])]
+
+    if encoding == 'cycle_id' and payload.get('derived'):
+        return [f"{t}_{u}" for t, u in zip(tickers, unix_times)]
+
+    return payload['values']
+
+def write_cycle_archive(path, target_date, cycles, compression=None, block_rows=KEYFRAME_ROWS):
+    """Write Cycle records to a columnar archive at path
+
+    Layout: MAGIC, u32 header length, JSON header (rows, compression and
+    per-block, per-column offset/length/encoding), then one independently
+    compressed blob per column per block. Readers fetch just the columns and
+    blocks they need. Quotes and TICKER_DELTA_COLUMNS are coded against the
+    same ticker's previous row, so repeated snapshots cost almost nothing.
+    """
+    compression = compression or default_compression()
+
+    blobs = []
+    blocks = []
+    offset = 0
+    for block_start in range(0, max(len(cycles), 1), block_rows):
+        block = cycles[block_start:block_start + block_rows]
+        tickers = [c.market_ticker for c in block]
+        unix_times = [c.unix_time for c in block]
+        columns = {}
+        for name, encoding in COLUMN_ENCODINGS.items():
+            values = [getattr(c, name) for c in block]
+            if name in QUOTE_REFERENCES:
+                reference = QUOTE_REFERENCES[name]
+                references = [getattr(c, reference) for c in block] if reference else None
+                payload = _encode_quote_delta(values, _quote_reference(name, references, len(block)), tickers)
+                encoding = 'quote_delta'
+            elif name in TICKER_DELTA_COLUMNS:
+                payload = _encode_ticker_delta(encoding, values, tickers)
+                encoding = 'ticker_delta'
+            else:
+                payload = _encode_column(encoding, values, tickers, unix_times)
+            blob = compress_blob(json.dumps(payload, separators=(',', ':')).encode(), compression)
+            columns[name] = {"encoding": encoding, "offset": offset, "length": len(blob)}
+            blobs.append(blob)
+            offset += len(blob)
+        blocks.append({"rows": len(block), "columns": columns})
+
+    header = json.dumps({
+        "date": target_date,
+        "rows": len(cycles),
+        "compression": compression,
+        "blocks": blocks
+    }, separators=(',', ':')).encode()
+
+    atomic_write(path, b''.join([MAGIC, struct.pack('<I', len(header)), header, *blobs]))
+    return offset + len(header) + len(MAGIC) + 4
+
+def read_archive_header(f):
+    """Read and validate the header; leaves f positioned at the first blob
+
+    Version 1 archives are presented as a single block.
+    """
+    magic = f.read(len(MAGIC))
+    if magic not in (MAGIC, MAGIC_V1):
+        raise ValueError("Not a cycle archive")
+    (header_len,) = struct.unpack('<I', f.read(4))
+    header = json.loads(f.read(header_len))
+    if 'blocks' not in header:
+        header['blocks'] = [{"rows": header['rows'], "columns": header.pop('columns')}]
+    return header
+
+def _read_block(f, base, block, compression, wanted):
+    """Decode the wanted columns of one block (plus whatever they are coded against) as {name: list}"""
+    decoded = {}
+
+    def column(name):
+        if name in decoded:
+            return decoded[name]
+        meta = block['columns'][name]
+        f.seek(base + meta['offset'])
+        encoding = meta['encoding']
+        payload = json.loads(decompress_blob(f.read(meta['length']), compression))
+        if encoding == 'quote_delta':
+            reference = QUOTE_REFERENCES[name]
+            references = _quote_reference(name, column(reference) if reference else None, block['rows'])
+            values = _decode_quote_delta(payload, references, column('market_ticker'))
+        elif encoding == 'ticker_delta':
+            values = _decode_ticker_delta(payload, column('market_ticker'))
+        elif encoding == 'cycle_id' and payload.get('derived'):
+            values = _decode_column(encoding, payload, column('market_ticker'), column('unix_time'))
+        else:
+            values = _decode_column(encoding, payload)
+        decoded[name] = values
+        return values
+
+    return {name: column(name) for name in wanted}
+
+def read_cycle_columns(path, columns=None):
+    """Load only the requested columns from a .kcc archive as {name: list}"""
+    return read_cycle_rows(path, columns=columns)
+
+def read_cycle_rows(path, start=0, stop=None, columns=None):
+    """Columns for rows [start, stop) of a .kcc archive, decoding only the blocks that overlap"""
+    wanted = list(columns) if columns else list(COLUMN_ENCODINGS)
+    result = {name: [] for name in wanted}
+
+    with open(path, 'rb') as f:
+        header = read_archive_header(f)
+        base = f.tell()
+        stop = header['rows'] if stop is None else min(stop, header['rows'])
+        block_start = 0
+        for block in header['blocks']:
+            block_stop = block_start + block['rows']
+            if block_start < stop and block_stop > start:
+                decoded = _read_block(f, base, block, header['compression'], wanted)
+                first, last = max(start - block_start, 0), min(stop, block_stop) - block_start
+                for name in wanted:
+                    result[name].extend(decoded[name][first:last])
+            block_start = block_stop
+    return result
+
+def _legacy_columns(path, columns=None):
+    """Compatibility loader for the old indent=2 JSON dumps"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    cycles = [Cycle.from_dict(c) for c in data.get('cycles', [])]
+    wanted = list(columns) if columns else list(COLUMN_ENCODINGS)
+    return {name: [getattr(c, name) for c in cycles] for name in wanted}
+
+def archive_path(cycles_dir, target_date):
+    """Path of the archive for a day, preferring the columnar file if both exist"""
+    columnar = os.path.join(cycles_dir, f"{target_date}{ARCHIVE_SUFFIX}")
+    if os.path.exists(columnar):
+        return columnar
+    legacy = os.path.join(cycles_dir, f"{target_date}{LEGACY_SUFFIX}")
+    if os.path.exists(legacy):
+        return legacy
+    return None
+
+def load_day_columns(cycles_dir, target_date, columns=None):
+    """Columns for one archived day from either format ({} if the day is missing)"""
+    path = archive_path(cycles_dir, target_date)
+    if path is None:
+        return {}
+    if path.endswith(LEGACY_SUFFIX):
+        return _legacy_columns(path, columns)
+    return read_cycle_columns(path, columns)
+
+def load_day_cycles(cycles_dir, target_date):
+    """Full Cycle records for one archived day from either format"""
+    columns = load_day_columns(cycles_dir, target_date)
+    if not columns:
+        return []
+    names = list(columns)
+    return [Cycle(**dict(zip(names, row))) for row in zip(*columns.values())]
+
+def archived_dates(cycles_dir):
+    """Sorted YYYY-MM-DD dates present in cycles_dir in either format"""
+    dates = set()
+    for name in os.listdir(cycles_dir):
+        for suffix in (ARCHIVE_SUFFIX, LEGACY_SUFFIX):
+            if name.endswith(suffix):
+                dates.add(name[:-len(suffix)])
+    return sorted(dates)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Secondary index over btc_cycle_log.jsonl (per ET day: ticker/decision/close_time postings + numeric columns)
+Queries evaluate predicates on the index and decode only the matching log lines or segment frames
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+from build_cache import atomic_write
+from cycle_log import checkpoint_is_valid, file_identity, iter_line_bounds, open_mapped
+from cycle_record import price_to_cents
+from log_segments import default_segments_dir, iter_segment_frames, load_manifest, sealed_offset
+
+INDEX_VERSION = 1
+POSTING_FIELDS = ('market_ticker', 'decision', 'close_time')
+DEFAULT_LOG = "/home/ubuntu/clawd/kalshi-bot/btc_cycle_log.jsonl"
+
+def default_index_dir(cycle_file):
+    return f"{cycle_file}.index"
+
+def _partition_path(index_dir, day):
+    return os.path.join(index_dir, f"{day}.json")
+
+def _empty_partition(day, segment=None):
+    """Rows of a log partition point at (byte offset, length) in the live log;
+    rows of a segment partition point at (frame number, line in frame) in segment['file']
+    """
+    return {
+        "date": day,
+        "segment": segment,
+        "rows": 0,
+        "offset": [], "length": [],
+        "unix_time": [], "yes_ask": [], "no_ask": [],
+        "time_remaining": [],
+        "postings": {field: {} for field in POSTING_FIELDS}
+    }
+
+def load_partition(index_dir, day):
+    try:
+        with open(_partition_path(index_dir, day), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _load_state(index_dir):
+    try:
+        with open(os.path.join(index_dir, "state.json"), 'r') as f:
+            state = json.load(f)
+        return state if state.get('version') == INDEX_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+def _add_row(partition, record, offset, length):
+    row = partition['rows']
+    partition['rows'] += 1
+    partition['offset'].append(offset)
+    partition['length'].append(length)
+    partition['unix_time'].append(record.get('unix_time') or 0)
+    partition['yes_ask'].append(price_to_cents(record.get('yes_ask')))
+    partition['no_ask'].append(price_to_cents(record.get('no_ask')))
+    partition['time_remaining'].append(record.get('time_remaining') or 0)
+    for field in POSTING_FIELDS:
+        partition['postings'][field].setdefault(record.get(field) or '', []).append(row)
+
+def _index_segment(index_dir, segments_dir, day, entry):
+    """Re-point a sealed day's partition at its segment; returns the number of rows"""
+    partition = _empty_partition(day, {"file": entry['file'], "rows": entry['rows'], "bytes": entry['bytes']})
+    for frame, lines in iter_segment_frames(os.path.join(segments_dir, entry['file'])):
+        for line_no, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            _add_row(partition, record, frame, line_no)
+    atomic_write(_partition_path(index_dir, day), json.dumps(partition, separators=(',', ':')))
+    return partition['rows']
+
+def _sealed_partition_is_current(partition, entry):
+    segment = (partition or {}).get('segment')
+    return bool(segment) and (segment['file'], segment['rows'], segment['bytes']) == (entry['file'], entry['rows'], entry['bytes'])
+
+def update_index(cycle_file, index_dir=None, segments_dir=None):
+    """Index log lines appended since the last update; returns the number of new rows
+
+    Only complete lines are consumed. Days sealed by log_segments.py are
+    indexed once from their segment and their byte range of the live log is
+    skipped. A rotated or rewritten log (see cycle_log.checkpoint_is_valid)
+    drops only the partitions that point into the live log.
+    """
+    index_dir = index_dir or default_index_dir(cycle_file)
+    segments_dir = segments_dir or default_segments_dir(cycle_file)
+    os.makedirs(index_dir, exist_ok=True)
+    manifest = load_manifest(segments_dir)
+    sealed = manifest['segments']
+
+    added = 0
+    for day, entry in sealed.items():
+        if not _sealed_partition_is_current(load_partition(index_dir, day), entry):
+            added += _index_segment(index_dir, segments_dir, day, entry)
+
+    state = _load_state(index_dir)
+    if state and not checkpoint_is_valid(cycle_file, state):
+        print("⚠️ Cycle log rotated or rewritten - rebuilding cycle index")
+        for day in indexed_dates(index_dir):
+            if day not in sealed:
+                os.remove(_partition_path(index_dir, day))
+        state = None
+    if not os.path.exists(cycle_file):
+        return added
+    start = max(state['offset'] if state else 0, sealed_offset(segments_dir, cycle_file, manifest))
+
+    partitions = {}
+    offset = start
+    with open_mapped(cycle_file) as mm:
+        if mm is None:
+            return added
+        end = mm.rfind(b'\n', start) + 1
+        for line_start, line_end in iter_line_bounds(mm, start, end):
+            try:
+                record = json.loads(mm[line_start:line_end])
+            except ValueError:
+                continue
+            day = (record.get('timestamp') or '')[:10]
+            if not day or day in sealed:
+                continue  # Stragglers for a sealed day are indexed once they are rolled into its segment
+            partition = partitions.get(day)
+            if partition is None:
+                partition = partitions[day] = load_partition(index_dir, day) or _empty_partition(day)
+            _add_row(partition, record, line_start, line_end - line_start)
+            added += 1
+        offset = max(start, end)
+
+    for day, partition in partitions.items():
+        atomic_write(_partition_path(index_dir, day), json.dumps(partition, separators=(',', ':')))
+
+    state = file_identity(cycle_file)
+    state.update({"version": INDEX_VERSION, "offset": offset})
+    atomic_write(os.path.join(index_dir, "state.json"), json.dumps(state, indent=2))
+    return added
+
+def indexed_dates(index_dir):
+    return sorted(name[:-5] for name in os.listdir(index_dir) if name[:4].isdigit() and name.endswith('.json'))
+
+def _matching_rows(partition, ticker=None, decision=None, close_time=None, side=None,
+                   min_price=None, max_price=None, min_remaining=None, max_remaining=None):
+    """Row ids passing every predicate, using postings first and columns after"""
+    candidates = None
+    for field, value in (('market_ticker', ticker), ('decision', decision), ('close_time', close_time)):
+        if value is None:
+            continue
+        rows = partition['postings'][field].get(value, [])
+        candidates = rows if candidates is None else sorted(set(candidates).intersection(rows))
+        if not candidates:
+            return []
+    if candidates is None:
+        candidates = range(partition['rows'])
+
+    checks = []
+    if min_price is not None or max_price is not None:
+        prices = partition['no_ask' if side == 'no' else 'yes_ask']
+        low = price_to_cents(min_price) if min_price is not None else None
+        high = price_to_cents(max_price) if max_price is not None else None
+        checks.append(lambda r: (low is None or prices[r] >= low) and (high is None or prices[r] <= high))
+    if min_remaining is not None or max_remaining is not None:
+        remaining = partition['time_remaining']
+        checks.append(lambda r: (min_remaining is None or remaining[r] >= min_remaining) and
+                                (max_remaining is None or remaining[r] <= max_remaining))
+    return [r for r in candidates if all(check(r) for check in checks)]
+
+def _read_segment_rows(segments_dir, partition, rows):
+    """Decode matching rows of a sealed day, decompressing only the frames that hold them"""
+    wanted = {}
+    for row in rows:
+        wanted.setdefault(partition['offset'][row], []).append(partition['length'][row])
+    results = []
+    for frame, lines in iter_segment_frames(os.path.join(segments_dir, partition['segment']['file']), frames=wanted):
+        results.extend(json.loads(lines[line_no]) for line_no in wanted[frame])
+    return results
+
+def query(cycle_file, dates, index_dir=None, segments_dir=None, **predicates):
+    """Cycle records on `dates` matching the predicates; only matching lines are decoded
+
+    Sealed days are read from their segment, touching only frames with matches.
+
+    Predicates: ticker, decision, close_time (exact), side ('yes'/'no', which
+    ask min_price/max_price apply to; defaults to the decision's side) and
+    min_remaining/max_remaining in minutes.
+    """
+    index_dir = index_dir or default_index_dir(cycle_file)
+    decision = predicates.get('decision') or ''
+    if predicates.get('side') is None and decision.startswith('BUY_'):
+        predicates['side'] = decision[4:].lower()
+
+    segments_dir = segments_dir or default_segments_dir(cycle_file)
+
+    results = []
+    log = None  # Opened only if a day still lives in the live log
+    try:
+        for day in dates:
+            partition = load_partition(index_dir, day)
+            if partition is None:
+                continue
+            rows = _matching_rows(partition, **predicates)
+            if partition.get('segment'):
+                results.extend(_read_segment_rows(segments_dir, partition, rows))
+                continue
+            if rows and log is None:
+                log = open(cycle_file, 'rb')
+            for row in rows:
+                log.seek(partition['offset'][row])
+                results.append(json.loads(log.read(partition['length'][row])))
+    finally:
+        if log is not None:
+            log.close()
+    return results
+
+def _date_range(first, last):
+    start = datetime.strptime(first, '%Y-%m-%d')
+    days = (datetime.strptime(last, '%Y-%m-%d') - start).days
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days + 1)]
+
+def main():
+    """Command line access to the cycle index"""
+    parser = argparse.ArgumentParser(description="Cycle log secondary index")
+    parser.add_argument('--log', default=DEFAULT_LOG)
+    parser.add_argument('--index-dir')
+    parser.add_argument('--segments-dir')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('update', help='Index newly appended log lines')
+
+    q = sub.add_parser('query', help='Print matching cycles as JSON lines')
+    q.add_argument('--date', help='YYYY-MM-DD (default: every indexed day)')
+    q.add_argument('--from', dest='from_date')
+    q.add_argument('--to', dest='to_date')
+    q.add_argument('--ticker')
+    q.add_argument('--decision', help='e.g. BUY_NO, BUY_YES, SKIP')
+    q.add_argument('--close-time')
+    q.add_argument('--side', choices=('yes', 'no'), help='Ask the price bounds apply to')
+    q.add_argument('--min-price', type=float)
+    q.add_argument('--max-price', type=float)
+    q.add_argument('--min-remaining', type=float, help='Minutes left in the window')
+    q.add_argument('--max-remaining', type=float)
+    q.add_argument('--no-update', action='store_true', help='Skip indexing new lines first')
+    args = parser.parse_args()
+
+    index_dir = args.index_dir or default_index_dir(args.log)
+    if args.command == 'update' or not args.no_update:
+        added = update_index(args.log, index_dir, args.segments_dir)
+        if args.command == 'update':
+            print(f"✅ {added} new cycles indexed in {index_dir}/")
+            return
+
+    if args.date:
+        dates = [args.date]
+    elif args.from_date:
+        dates = _date_range(args.from_date, args.to_date or indexed_dates(index_dir)[-1])
+    else:
+        dates = indexed_dates(index_dir)
+
+    for record in query(args.log, dates, index_dir, args.segments_dir, ticker=args.ticker, decision=args.decision,
+                        close_time=args.close_time, side=args.side, min_price=args.min_price,
+                        max_price=args.max_price, min_remaining=args.min_remaining,
+                        max_remaining=args.max_remaining):
+        print(json.dumps(record))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Cycle log reader for btc_cycle_log.jsonl
+Keeps an ingestion checkpoint so nightly runs only parse new lines
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Optional: LogTailer falls back to polling
+    INotify = None
+
+CHECKPOINT_VERSION = 1
+IDENTITY_BYTES = 256  # Leading bytes hashed to recognise the same log file
+TIMESTAMP_KEYS = (b'"timestamp": "', b'"timestamp":"')  # json.dumps default / compact separators
+
+def load_checkpoint(checkpoint_file):
+    """Load the persisted ingestion checkpoint, or None if missing/corrupt"""
+    try:
+        with open(checkpoint_file, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            return None
+        return checkpoint
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(checkpoint_file, checkpoint):
+    """Persist the checkpoint atomically (temp file + rename)"""
+    tmp_file = f"{checkpoint_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_file, checkpoint_file)
+
+def file_identity(cycle_file, length=IDENTITY_BYTES):
+    """Return (dev, inode, size, head_hash, head_len) for the log file"""
+    st = os.stat(cycle_file)
+    with open(cycle_file, 'rb') as f:
+        head = f.read(length)
+    return {
+        "dev": st.st_dev,
+        "inode": st.st_ino,
+        "size": st.st_size,
+        "head_len": len(head),
+        "head_hash": hashlib.sha1(head).hexdigest(),
+    }
+
+def checkpoint_is_valid(cycle_file, checkpoint):
+    """Detect rotation (new inode / different head) and truncation (shrunk file)"""
+    if not checkpoint:
+        return False
+    try:
+        current = file_identity(cycle_file, checkpoint.get('head_len', IDENTITY_BYTES))
+    except OSError:
+        return False
+
+    if current['dev'] != checkpoint.get('dev') or current['inode'] != checkpoint.get('inode'):
+        return False  # Rotated: a new file now lives at this path
+    if current['size'] < checkpoint.get('offset', 0):
+        return False  # Truncated below what we already consumed
+    if current['head_hash'] != checkpoint.get('head_hash'):
+        return False  # Rewritten in place
+    return True
+
+@contextmanager
+def open_mapped(cycle_file):
+    """Map the log read-only; yields None for an empty file (mmap refuses those)"""
+    with open(cycle_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def iter_line_bounds(mm, start, end):
+    """Zero-copy line splitter: yield (line_start, line_end) offsets within [start, end)"""
+    pos = start
+    while pos < end:
+        nl = mm.find(b'\n', pos, end)
+        if nl == -1:
+            return
+        yield pos, nl + 1
+        pos = nl + 1
+
+def _timestamp_key(mm, start, end):
+    """Detect which separator style the log uses from its first line"""
+    first_end = mm.find(b'\n', start, end)
+    first_end = end if first_end == -1 else first_end
+    for key in TIMESTAMP_KEYS:
+        if mm.find(key, start, first_end) != -1:
+            return key
+    return TIMESTAMP_KEYS[0]
+
+def scan_cycles_for_date(mm, target_date, start=0, end=None):
+    """Decode only the lines in mm[start:end] whose raw bytes carry target_date
+
+    The `"timestamp": "YYYY-MM-DD` needle is located with mmap.find, so
+    lines from other days are skipped at memchr speed without json.loads.
+    The log is append-only, so a day's lines form one contiguous run between
+    the first and last needle hit; only that run is split and decoded.
+    """
+    end = len(mm) if end is None else end
+    needle = _timestamp_key(mm, start, end) + target_date.encode()
+
+    first = mm.find(needle, start, end)
+    if first == -1:
+        return []
+    last = mm.rfind(needle, first, end)
+    run_start = max(mm.rfind(b'\n', start, first) + 1, start)
+    run_end = mm.find(b'\n', last, end) + 1 or end
+
+    cycles = []
+    for line_start, line_end in iter_line_bounds(mm, run_start, run_end):
+        if mm.find(needle, line_start, line_end) == -1:
+            continue
+        try:
+            cycles.append(json.loads(mm[line_start:line_end]))
+        except ValueError:
+            continue
+    return cycles
+
+def _last_line_date(mm, start, end):
+    """Date (YYYY-MM-DD) of the last parseable complete line in [start, end)"""
+    line_end = end
+    while line_end > start:
+        line_start = max(mm.rfind(b'\n', start, line_end - 1) + 1, start)
+        try:
+            cycle_date = json.loads(mm[line_start:line_end]).get('timestamp', '')[:10]
+        except ValueError:
+            cycle_date = ''
+        if cycle_date:
+            return cycle_date
+        line_end = line_start
+    return None
+
+def _first_line_for_date(mm, cycle_date, start, end):
+    """Offset of the first line in [start, end) stamped with cycle_date"""
+    needle = _timestamp_key(mm, start, end) + cycle_date.encode()
+    hit = mm.find(needle, start, end)
+    if hit == -1:
+        return start
+    return max(mm.rfind(b'\n', start, hit) + 1, start)
+
+def _resume_offset(checkpoint, target_date):
+    """Pick the byte offset to start scanning from for target_date"""
+    last_date = checkpoint.get('last_date') or ''
+    if target_date == last_date:
+        return checkpoint.get('last_date_offset', 0)  # Re-read today's slice only
+    if target_date > last_date:
+        return checkpoint.get('offset', 0)  # Everything before is an older day
+    return 0  # Re-reporting a past day: no shortcut
+
+def read_cycles_for_date(cycle_file, target_date, checkpoint_file=None):
+    """Return the cycles whose timestamp falls on target_date (YYYY-MM-DD)
+
+    With a checkpoint_file, resumes from the last consumed byte offset and
+    updates the checkpoint afterwards. Only complete (newline-terminated)
+    lines advance the offset, so a line the bot is still writing is picked
+    up on the next run.
+    """
+    checkpoint = load_checkpoint(checkpoint_file) if checkpoint_file else None
+    if checkpoint and not checkpoint_is_valid(cycle_file, checkpoint):
+        print("⚠️ Cycle log rotated or truncated - resetting ingestion checkpoint")
+        checkpoint = None
+
+    start = _resume_offset(checkpoint, target_date) if checkpoint else 0
+    last_date = checkpoint.get('last_date') if checkpoint else None
+    last_date_offset = checkpoint.get('last_date_offset', 0) if checkpoint else 0
+
+    cycles = []
+    offset = start
+    with open_mapped(cycle_file) as mm:
+        if mm is not None:
+            # Only complete (newline-terminated) lines are consumed
+            offset = max(start, mm.rfind(b'\n', start) + 1)
+            cycles = scan_cycles_for_date(mm, target_date, start, offset)
+
+            newest = _last_line_date(mm, start, offset)
+            if newest and (last_date is None or newest > last_date):
+                last_date = newest
+                last_date_offset = _first_line_for_date(mm, newest, start, offset)
+
+    if checkpoint_file and (checkpoint is None or offset >= checkpoint.get('offset', 0)):
+        new_checkpoint = file_identity(cycle_file)
+        new_checkpoint.update({
+            "version": CHECKPOINT_VERSION,
+            "path": os.path.abspath(cycle_file),
+            "offset": offset,
+            "last_date": last_date,
+            "last_date_offset": last_date_offset,
+        })
+        try:
+            save_checkpoint(checkpoint_file, new_checkpoint)
+        except OSError as e:
+            print(f"⚠️ Could not save ingestion checkpoint: {e}")
+
+    return cycles
+
+def _record_at_or_after(f, pos, size):
+    """Return (line_offset, unix_time) of the first parseable line starting at >= pos
+
+    Seeks to pos and, unless pos is already a line start, resyncs by
+    discarding the rest of the current line. Returns (size, None) at EOF.
+    """
+    if pos > 0:
+        f.seek(pos - 1)
+        if f.read(1) != b'\n':
+            f.readline()  # Resync to the next line boundary
+    else:
+        f.seek(0)
+
+    while True:
+        line_offset = f.tell()
+        if line_offset >= size:
+            return size, None
+        line = f.readline()
+        if not line.endswith(b'\n'):
+            return size, None  # Partial trailing line
+        try:
+            unix_time = json.loads(line).get('unix_time')
+        except ValueError:
+            continue
+        if unix_time is not None:
+            return line_offset, unix_time
+
+def find_offset_for_time(f, size, target_unix):
+    """Binary-search the byte offset of the first line with unix_time >= target_unix
+
+    Relies on unix_time being non-decreasing through the file, which holds
+    for the bot's append-only cycle log.
+    """
+    lo, hi = 0, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        _, unix_time = _record_at_or_after(f, mid, size)
+        if unix_time is None or unix_time >= target_unix:
+            hi = mid
+        else:
+            lo = mid + 1
+    return _record_at_or_after(f, lo, size)[0]
+
+def read_cycles_between(cycle_file, start_unix, end_unix):
+    """Return cycles with start_unix <= unix_time < end_unix
+
+    Costs O(log n) seeks to locate the window plus one read of its bytes,
+    independent of how much history the log holds.
+    """
+    size = os.path.getsize(cycle_file)
+    cycles = []
+    with open(cycle_file, 'rb') as f:
+        start = find_offset_for_time(f, size, start_unix)
+        end = find_offset_for_time(f, size, end_unix)
+        if end <= start:
+            return cycles
+
+        f.seek(start)
+        for line in f.read(end - start).splitlines():
+            try:
+                cycle = json.loads(line)
+            except ValueError:
+                continue
+            if start_unix <= cycle.get('unix_time', start_unix - 1) < end_unix:
+                cycles.append(cycle)
+    return cycles
+
+def day_partitions(cycle_file, dates):
+    """Split the log into per-day byte ranges in one forward pass
+
+    dates must be sorted YYYY-MM-DD strings. Returns {date: (start, end)};
+    each range covers that day's contiguous run of lines (empty when the day
+    has no cycles). Only complete lines are included.
+    """
+    partitions = {}
+    with open_mapped(cycle_file) as mm:
+        if mm is None:
+            return {d: (0, 0) for d in dates}
+        end_of_data = mm.rfind(b'\n') + 1
+        key = _timestamp_key(mm, 0, end_of_data)
+
+        day_after = (datetime.strptime(dates[-1], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        starts = []
+        pos = 0
+        for day in list(dates) + [day_after]:
+            hit = mm.find(key + day.encode(), pos, end_of_data)
+            if hit == -1:
+                starts.append(None)
+                continue
+            pos = max(mm.rfind(b'\n', 0, hit) + 1, 0)
+            starts.append(pos)
+
+        # A day ends where the next day that has data begins
+        next_start = end_of_data
+        for i in range(len(dates) - 1, -1, -1):
+            if starts[i + 1] is not None:
+                next_start = starts[i + 1]
+            start = starts[i] if starts[i] is not None else next_start
+            partitions[dates[i]] = (start, next_start)
+    return partitions
+
+class LogTailer:
+    """Follow a growing log from a byte offset, yielding only complete new lines
+
+    Rotation (new inode) or truncation restarts from the top of the new
+    file. Waits use inotify when the optional inotify_simple module is
+    installed, otherwise the file is polled.
+    """
+
+    def __init__(self, cycle_file, offset=0, poll_interval=1.0):
+        self.cycle_file = cycle_file
+        self.offset = offset
+        self.poll_interval = poll_interval
+        self._file = None
+        self._inode = None
+        self._inotify = None
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(os.path.dirname(os.path.abspath(cycle_file)),
+                                        inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO)
+            except OSError:
+                self._inotify = None
+
+    def _reopen_if_rotated(self):
+        try:
+            st = os.stat(self.cycle_file)
+        except OSError:
+            return False
+        if self._file is None or st.st_ino != self._inode or st.st_size < self.offset:
+            if self._file is not None:
+                self._file.close()
+                self.offset = 0  # A different (or truncated) file: start from its beginning
+            self._file = open(self.cycle_file, 'rb')
+            self._inode = st.st_ino
+        return True
+
+    def read_lines(self):
+        """Complete lines appended since the last call (partial last line is left for later)"""
+        if not self._reopen_if_rotated():
+            return []
+        self._file.seek(self.offset)
+        data = self._file.read()
+        cut = data.rfind(b'\n') + 1
+        if not cut:
+            return []
+        self.offset += cut
+        return data[:cut].splitlines()
+
+    def wait(self, timeout):
+        """Block until the log directory changes or timeout seconds pass"""
+        if self._inotify is not None:
+            self._inotify.read(timeout=int(timeout * 1000))
+        else:
+            time.sleep(min(timeout, self.poll_interval))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._inotify is not None:
+            self._inotify.close()
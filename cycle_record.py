@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compact typed cycle records
+Parses each btc_cycle_log.jsonl record once into integer-cent prices
+"""
+
+import sys
+
+PRICE_FIELDS = ('yes_ask', 'no_ask', 'yes_bid', 'no_bid')
+
+def price_to_cents(value):
+    """'0.5900' / 0.59 / None -> 59 (prices are quoted in whole cents)"""
+    if value is None or value == '':
+        return 0
+    return int(round(float(value) * 100))
+
+def cents_to_price(cents):
+    """59 -> '0.5900', the string format the bot logs"""
+    return f"{cents / 100:.4f}"
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Cycle:
+    """One market analysis cycle with prices held as integer cents"""
+    __slots__ = (
+        'timestamp', 'unix_time', 'market_ticker', 'market_title',
+        'yes_ask', 'no_ask', 'yes_bid', 'no_bid', 'time_remaining',
+        'decision', 'reasoning', 'close_time', 'outcome', 'would_profit',
+        'cycle_id'
+    )
+
+    def __init__(self, timestamp='', unix_time=0, market_ticker='', market_title='',
+                 yes_ask=0, no_ask=0, yes_bid=0, no_bid=0, time_remaining=0,
+                 decision='', reasoning='', close_time='', outcome=None,
+                 would_profit=None, cycle_id=''):
+        self.timestamp = timestamp
+        self.unix_time = unix_time
+        self.market_ticker = _intern(market_ticker)
+        self.market_title = _intern(market_title)
+        self.yes_ask = yes_ask
+        self.no_ask = no_ask
+        self.yes_bid = yes_bid
+        self.no_bid = no_bid
+        self.time_remaining = time_remaining
+        self.decision = _intern(decision)
+        self.reasoning = reasoning
+        self.close_time = _intern(close_time)
+        self.outcome = outcome
+        self.would_profit = would_profit
+        self.cycle_id = cycle_id
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build from a raw log record (string prices) in one pass"""
+        return cls(
+            timestamp=record.get('timestamp') or '',
+            unix_time=record.get('unix_time') or 0,
+            market_ticker=record.get('market_ticker') or '',
+            market_title=record.get('market_title') or '',
+            yes_ask=price_to_cents(record.get('yes_ask')),
+            no_ask=price_to_cents(record.get('no_ask')),
+            yes_bid=price_to_cents(record.get('yes_bid')),
+            no_bid=price_to_cents(record.get('no_bid')),
+            time_remaining=record.get('time_remaining') or 0,
+            decision=record.get('decision') or '',
+            reasoning=record.get('reasoning') or '',
+            close_time=record.get('close_time') or '',
+            outcome=record.get('outcome'),
+            would_profit=record.get('would_profit'),
+            cycle_id=record.get('cycle_id') or ''
+        )
+
+    def to_dict(self):
+        """Render back to the bot's log format (prices as '0.5900' strings)"""
+        return {
+            "timestamp": self.timestamp,
+            "unix_time": self.unix_time,
+            "market_ticker": self.market_ticker,
+            "market_title": self.market_title,
+            "yes_ask": cents_to_price(self.yes_ask),
+            "no_ask": cents_to_price(self.no_ask),
+            "yes_bid": cents_to_price(self.yes_bid),
+            "no_bid": cents_to_price(self.no_bid),
+            "time_remaining": self.time_remaining,
+            "decision": self.decision,
+            "reasoning": self.reasoning,
+            "close_time": self.close_time,
+            "outcome": self.outcome,
+            "would_profit": self.would_profit,
+            "cycle_id": self.cycle_id
+        }
+
+    @property
+    def is_buy(self):
+        return self.decision.startswith('BUY_')
+
+    @property
+    def side(self):
+        """'yes' / 'no' for BUY decisions, '' otherwise"""
+        return self.decision[4:].lower() if self.is_buy else ''
+
+    @property
+    def entry_cents(self):
+        """Ask paid on the side the decision buys"""
+        return self.yes_ask if 'YES' in self.decision else self.no_ask
+
+    def __repr__(self):
+        return f"Cycle({self.market_ticker} {self.timestamp} {self.decision})"
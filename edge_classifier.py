@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Edge classification for cycle reasoning
+Classifies each distinct reasoning template once and pulls its numbers into named fields
+"""
+
+import argparse
+import re
+from collections import Counter
+from functools import lru_cache
+
+from cycle_archive import NUMBER_PATTERN, load_day_columns
+
+# Structured tags the bot prefixes onto reasoning, in priority order
+EDGE_TAGS = (
+    ('LATE_WINDOW_LOCK', 'late_window_lock'),
+    ('SPEED_ADVANTAGE', 'speed_advantage'),
+    ('VOLATILITY_MISPRICING', 'volatility_mispricing'),
+)
+TAG_PATTERN = re.compile(r'\[(' + '|'.join(tag for tag, _ in EDGE_TAGS) + r')\]')
+TAG_PRIORITY = {tag: (rank, edge) for rank, (tag, edge) in enumerate(EDGE_TAGS)}
+
+# Numeric fields by phrase; {} marks a number slot in the template
+FIELD_RULES = (
+    (re.compile(r'cheap at \$\{\} \(threshold: \$\{\}\)'), ('price', 'threshold')),
+    (re.compile(r'Both sides expensive - YES: \$\{\}, NO: \$\{\}'), ('yes_price', 'no_price')),
+    (re.compile(r'\{\}m left, YES \{\}/NO \{\}'), ('minutes_left', 'yes_price', 'no_price')),
+    (re.compile(r'\(\{\}% < \{\}% threshold\)'), ('confidence', 'confidence_threshold')),
+)
+
+class Template:
+    """Classification shared by every reasoning string with the same shape"""
+    __slots__ = ('text', 'edge_type', 'fields')
+
+    def __init__(self, text, edge_type, fields):
+        self.text = text
+        self.edge_type = edge_type
+        self.fields = fields  # ((name, slot), ...)
+
+    def extract(self, reasoning):
+        """Named numbers from a reasoning string of this template"""
+        if not self.fields:
+            return {}
+        numbers = NUMBER_PATTERN.findall(reasoning)
+        return {name: float(numbers[slot]) for name, slot in self.fields}
+
+    def __repr__(self):
+        return f"Template({self.edge_type}: {self.text!r})"
+
+def template_of(reasoning):
+    """'YES cheap at $0.0000 (threshold: $0.35)' -> 'YES cheap at ${} (threshold: ${})'"""
+    return NUMBER_PATTERN.sub('{}', reasoning or '')
+
+@lru_cache(maxsize=4096)
+def classify_template(text):
+    """Edge type and field slots for one template (memoized)"""
+    edge_type = 'unknown'
+    tags = TAG_PATTERN.findall(text)
+    if tags:
+        edge_type = min(TAG_PRIORITY[tag] for tag in tags)[1]
+
+    fields = []
+    for pattern, names in FIELD_RULES:
+        match = pattern.search(text)
+        if match:
+            first_slot = text.count('{}', 0, match.start())
+            fields.extend((name, first_slot + i) for i, name in enumerate(names))
+    return Template(text, edge_type, tuple(fields))
+
+def classify(reasoning):
+    """(edge_type, template, fields) for one reasoning string"""
+    template = classify_template(template_of(reasoning))
+    return template.edge_type, template.text, template.extract(reasoning)
+
+def classify_column(reasonings):
+    """Columnar classification of a reasoning column
+
+    Returns {'edge_type': [...], 'template_id': [...], 'templates': [...]} plus
+    one list per extracted field (None where a row's template lacks it).
+    """
+    templates, lookup = [], {}
+    edge_types, template_ids, rows = [], [], []
+    for reasoning in reasonings:
+        text = template_of(reasoning)
+        template_id = lookup.get(text)
+        if template_id is None:
+            template_id = lookup[text] = len(templates)
+            templates.append(classify_template(text))
+        template = templates[template_id]
+        edge_types.append(template.edge_type)
+        template_ids.append(template_id)
+        rows.append(template.extract(reasoning))
+
+    columns = {
+        "edge_type": edge_types,
+        "template_id": template_ids,
+        "templates": [t.text for t in templates],
+    }
+    field_names = sorted(set(name for t in templates for name, _ in t.fields))
+    for name in field_names:
+        columns[name] = [row.get(name) for row in rows]
+    return columns
+
+def main():
+    """Print the reasoning templates of an archived day with their edge and fields"""
+    parser = argparse.ArgumentParser(description="Reasoning template breakdown for one day")
+    parser.add_argument('date', help='YYYY-MM-DD')
+    parser.add_argument('--cycles-dir', default='cycles')
+    args = parser.parse_args()
+
+    reasonings = load_day_columns(args.cycles_dir, args.date, ['reasoning']).get('reasoning', [])
+    counts = Counter(template_of(r) for r in reasonings)
+    print(f"{len(reasonings)} cycles, {len(counts)} distinct templates")
+    for text, count in counts.most_common():
+        template = classify_template(text)
+        fields = ', '.join(name for name, _ in template.fields) or '-'
+        print(f"{count:6d}  {template.edge_type:22s} [{fields}] {text[:100]}")
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,38 @@
 #!/usr/bin/env python3
 """
 Generate HTML dashboard with real trading data
-Called by nightly update script to refresh website
+Renders a standalone preview; the live site reads data.json instead
 """
 
 import json
 import os
+import re
 from datetime import datetime, date
 
+from settlement import format_pnl, summarize
+from update_dashboard_with_data import update_dashboard_data
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+def _fill(template, **values):
+    """Substitute {name} placeholders only; CSS/JS braces are left alone"""
+    return PLACEHOLDER.sub(lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0), template)
+
 def generate_dashboard_html(cycle_data, trades):
     """Generate the HTML dashboard with real data"""
     
     # Calculate metrics
     total_cycles = cycle_data.get('total_cycles', 0)
     total_trades = len(trades)
-    skips = total_cycles - total_trades
+    skips = total_cycles - cycle_data.get('buy_signals', total_trades)
     skip_rate = (skips / total_cycles * 100) if total_cycles > 0 else 0
     
-    # Win/loss calculation (placeholder for now)
-    wins = len([t for t in trades if t.get('market_result') in ['win', 'yes']])
-    losses = total_trades - wins
-    win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
+    # Win/loss and P/L from settled trades
+    pnl = summarize(trades)
+    win_rate = pnl['win_rate']
     
     # Edge breakdown
-    edge_stats = {}
-    for trade in trades:
-        edge = trade.get('edge_type', 'unknown')
-        if edge not in edge_stats:
-            edge_stats[edge] = {'trades': 0, 'wins': 0}
-        edge_stats[edge]['trades'] += 1
-        if trade.get('market_result') in ['win', 'yes']:
-            edge_stats[edge]['wins'] += 1
+    edge_stats = pnl['by_edge']
     
     html_template = '''<!DOCTYPE html>
 <html lang="en">
@@ -39,11 +41,11 @@ def generate_dashboard_html(cycle_data, trades):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Kalshi BTC Trading Dashboard</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
         body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -285,15 +287,15 @@ def generate_dashboard_html(cycle_data, trades):
                 <div class="label">Total Trades</div>
             </div>
             <div class="quick-stat">
-                <div class="number">{win_rate:.1f}%</div>
+                <div class="number">{win_rate}</div>
                 <div class="label">Win Rate</div>
             </div>
             <div class="quick-stat">
-                <div class="number">{skip_rate:.1f}%</div>
+                <div class="number">{skip_rate}</div>
                 <div class="label">Skip Rate</div>
             </div>
             <div class="quick-stat">
-                <div class="number">$0.00</div>
+                <div class="number">{total_pnl}</div>
                 <div class="label">Total P/L</div>
             </div>
         </div>
@@ -307,11 +309,11 @@ def generate_dashboard_html(cycle_data, trades):
                         <div class="metric-label">Cycles Monitored</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">$0.00</div>
+                        <div class="metric-value">{best_trade}</div>
                         <div class="metric-label">Best Trade</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">$0.00</div>
+                        <div class="metric-value">{worst_trade}</div>
                         <div class="metric-label">Worst Trade</div>
                     </div>
                     <div class="metric">
@@ -343,7 +345,7 @@ def generate_dashboard_html(cycle_data, trades):
             <h2>📈 Recent Activity</h2>
             <div class="trade-summary">
                 <h3>Today ({today})</h3>
-                <p><strong>{total_cycles} cycles analyzed</strong> • <strong>{total_trades} trades executed</strong> • <strong>{skip_rate:.1f}% skip rate</strong></p>
+                <p><strong>{total_cycles} cycles analyzed</strong> • <strong>{total_trades} trades executed</strong> • <strong>{skip_rate} skip rate</strong></p>
                 
                 {recent_trades}
             </div>
@@ -369,17 +371,14 @@ def generate_dashboard_html(cycle_data, trades):
     }
     
     for edge, name in edge_names.items():
-        stats = edge_stats.get(edge, {'trades': 0, 'wins': 0})
-        trades_count = stats['trades']
-        wins_count = stats['wins']
-        win_rate_edge = (wins_count / trades_count * 100) if trades_count > 0 else 0
+        stats = edge_stats.get(edge, {'trades': 0, 'win_rate': 0, 'pnl': 0})
         
         edge_table_rows += f'''
                         <tr>
                             <td>{name}</td>
-                            <td>{trades_count}</td>
-                            <td>{win_rate_edge:.1f}%</td>
-                            <td>$0.00</td>
+                            <td>{stats['trades']}</td>
+                            <td>{stats['win_rate']:.1f}%</td>
+                            <td>{format_pnl(stats['pnl'])}</td>
                         </tr>'''
     
     # Generate recent trades
@@ -399,32 +398,29 @@ def generate_dashboard_html(cycle_data, trades):
         recent_trades_html = "<p><em>No trades executed yet today.</em></p>"
     
     # Fill in the template
-    return html_template.format(
+    return _fill(
+        html_template,
         last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S EST'),
         total_trades=total_trades,
-        win_rate=win_rate,
-        skip_rate=skip_rate,
+        win_rate=f"{win_rate:.1f}%",
+        skip_rate=f"{skip_rate:.1f}%",
         total_cycles=total_cycles,
+        total_pnl=format_pnl(pnl['total_pnl']),
+        best_trade=format_pnl(pnl['best_trade']),
+        worst_trade=format_pnl(pnl['worst_trade']),
         edge_table_rows=edge_table_rows,
         today=date.today().isoformat(),
         recent_trades=recent_trades_html
     )
 
-def update_dashboard(repo_path, cycle_data, trades):
-    """Update the HTML dashboard with latest data"""
+def update_dashboard(repo_path, cycle_data, trades, aggregates=None):
+    """Publish the latest numbers as data.json; the static index.html is not rewritten"""
     try:
-        html_content = generate_dashboard_html(cycle_data, trades)
-        
-        dashboard_path = os.path.join(repo_path, 'index.html')
-        with open(dashboard_path, 'w') as f:
-            f.write(html_content)
-        
-        print("✅ Dashboard HTML updated with real data")
-        return True
+        return update_dashboard_data(cycle_data, trades, aggregates, site_path=repo_path)
         
     except Exception as e:
         print(f"❌ Dashboard update error: {e}")
-        return False
+        return None
 
 if __name__ == "__main__":
     # Test with mock data
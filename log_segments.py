@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Segment manager for btc_cycle_log.jsonl
+Seals finished ET days into compressed, framed segments listed in a manifest; readers skip the sealed part of the live log
+
+The nightly run only seals: the live log keeps its sealed lines, so a sealed
+day is on disk twice until the log is compacted. Compaction swaps in a new
+file, and the bot keeps appending to the inode it already has open, so
+anything it writes after the swap would be lost. Stop the bot, run
+`python3 log_segments.py roll --compact`, then start it again.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+from datetime import date
+
+from build_cache import atomic_write
+from cycle_archive import compress_blob, decompress_blob, default_compression
+from cycle_log import TIMESTAMP_KEYS, checkpoint_is_valid, file_identity, iter_line_bounds, open_mapped, scan_cycles_for_date
+
+SEGMENT_MAGIC = b'KSEG1\n'
+SEGMENT_SUFFIX = ".seg"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+FRAME_ROWS = 2048  # Lines per independently compressed frame
+DEFAULT_LOG = "/home/ubuntu/clawd/kalshi-bot/btc_cycle_log.jsonl"
+
+def default_segments_dir(cycle_file):
+    return os.path.join(os.path.dirname(cycle_file) or '.', "btc_cycle_segments")
+
+def load_manifest(segments_dir):
+    """{"segments": {date: {file, rows, min_unix, max_unix, ...}}, "log": live log identity + sealed offset}"""
+    try:
+        with open(os.path.join(segments_dir, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "segments": {}, "log": None}
+
+def save_manifest(segments_dir, manifest):
+    atomic_write(os.path.join(segments_dir, MANIFEST_FILE), json.dumps(manifest, indent=2, sort_keys=True))
+
+def sealed_offset(segments_dir, cycle_file, manifest=None):
+    """Byte offset of the live log below which every line is already sealed (0 after a rotation)"""
+    manifest = manifest or load_manifest(segments_dir)
+    log = manifest.get('log')
+    if log and checkpoint_is_valid(cycle_file, log):
+        return log['offset']
+    return 0
+
+def write_segment(path, lines, compression=None):
+    """Write raw JSONL lines as a framed segment; returns its manifest entry
+
+    Layout: SEGMENT_MAGIC, compressed frames of FRAME_ROWS lines, a JSON
+    footer with each frame's offset/length/rows/unix range, then the footer
+    length (u32) and SEGMENT_MAGIC again so readers can find the footer
+    from the end.
+    """
+    compression = compression or default_compression()
+    frames = []
+    blobs = []
+    offset = len(SEGMENT_MAGIC)
+    unix_times = [json.loads(line).get('unix_time') or 0 for line in lines]
+    for i in range(0, len(lines), FRAME_ROWS):
+        chunk = lines[i:i + FRAME_ROWS]
+        blob = compress_blob(b''.join(chunk), compression)
+        frame_times = unix_times[i:i + FRAME_ROWS]
+        frames.append([offset, len(blob), len(chunk), min(frame_times), max(frame_times)])
+        blobs.append(blob)
+        offset += len(blob)
+
+    footer = json.dumps({
+        "compression": compression,
+        "rows": len(lines),
+        "frames": frames
+    }, separators=(',', ':')).encode()
+    data = SEGMENT_MAGIC + b''.join(blobs) + footer + struct.pack('<I', len(footer)) + SEGMENT_MAGIC
+    atomic_write(path, data)
+    return {
+        "file": os.path.basename(path),
+        "rows": len(lines),
+        "min_unix": min(unix_times) if unix_times else None,
+        "max_unix": max(unix_times) if unix_times else None,
+        "frames": len(frames),
+        "bytes": len(data),
+        "raw_bytes": sum(len(line) for line in lines),
+        "compression": compression,
+    }
+
+def read_segment_footer(f):
+    f.seek(-(len(SEGMENT_MAGIC) + 4), os.SEEK_END)
+    (footer_len,) = struct.unpack('<I', f.read(4))
+    if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+        raise ValueError("Not a log segment")
+    f.seek(-(len(SEGMENT_MAGIC) + 4 + footer_len), os.SEEK_END)
+    return json.loads(f.read(footer_len))
+
+def iter_segment_frames(path, frames=None):
+    """Yield (frame number, raw lines) for the wanted frame numbers only (all if frames is None)"""
+    with open(path, 'rb') as f:
+        footer = read_segment_footer(f)
+        for number, (offset, length, *_) in enumerate(footer['frames']):
+            if frames is not None and number not in frames:
+                continue
+            f.seek(offset)
+            yield number, decompress_blob(f.read(length), footer['compression']).splitlines(keepends=True)
+
+def read_segment_lines(path):
+    """All raw lines of a segment"""
+    return [line for _, lines in iter_segment_frames(path) for line in lines]
+
+def segment_path(segments_dir, manifest, day):
+    return os.path.join(segments_dir, manifest['segments'][day]['file'])
+
+def read_segment_day(segments_dir, target_date):
+    """All cycle records of a sealed day, or None if the day has no segment"""
+    manifest = load_manifest(segments_dir)
+    if target_date not in manifest['segments']:
+        return None
+    cycles = []
+    for line in read_segment_lines(segment_path(segments_dir, manifest, target_date)):
+        try:
+            cycles.append(json.loads(line))
+        except ValueError:
+            continue
+    return cycles
+
+def _cycle_key(cycle):
+    return cycle.get('timestamp'), cycle.get('cycle_id')
+
+def merge_sealed_day(segments_dir, target_date, live_cycles):
+    """A day's sealed cycles followed by live-log cycles the segment does not already hold"""
+    sealed = read_segment_day(segments_dir, target_date)
+    if not sealed:
+        return live_cycles
+    seen = {_cycle_key(c) for c in sealed}
+    return sealed + [c for c in live_cycles if _cycle_key(c) not in seen]
+
+def read_sealed_day(segments_dir, cycle_file, target_date):
+    """A sealed day's cycles plus stragglers logged after it was sealed, or None if it is not sealed
+
+    Only the live log past the sealed offset is scanned for stragglers.
+    """
+    manifest = load_manifest(segments_dir)
+    if target_date not in manifest['segments']:
+        return None
+    stragglers = []
+    if os.path.exists(cycle_file):
+        start = sealed_offset(segments_dir, cycle_file, manifest)
+        with open_mapped(cycle_file) as mm:
+            if mm is not None:
+                stragglers = scan_cycles_for_date(mm, target_date, start, mm.rfind(b'\n') + 1)
+    return merge_sealed_day(segments_dir, target_date, stragglers)
+
+def _line_date(mm, line_start, line_end):
+    """YYYY-MM-DD of a raw log line without decoding it ('' if there is none)"""
+    for key in TIMESTAMP_KEYS:
+        hit = mm.find(key, line_start, line_end)
+        if hit != -1:
+            return mm[hit + len(key):hit + len(key) + 10].decode(errors='replace')
+    return ''
+
+def _split_sealable(mm, start, before):
+    """({date: [lines]} for days < before from mm[start:], offset where unsealed lines begin)
+
+    Lines are taken up to the first complete line dated `before` or later;
+    anything after that stays unsealed until a later roll.
+    """
+    days = {}
+    end = mm.rfind(b'\n', start) + 1
+    keep_from = max(start, end)
+    for line_start, line_end in iter_line_bounds(mm, start, end):
+        line_date = _line_date(mm, line_start, line_end)
+        if line_date >= before:
+            keep_from = line_start
+            break
+        if line_date:
+            days.setdefault(line_date, []).append(mm[line_start:line_end])
+    return days, keep_from
+
+def _merge_lines(path, new_lines):
+    """Lines already in a segment plus the new ones it does not hold yet (keyed on timestamp + cycle_id)"""
+    sealed = read_segment_lines(path)
+    seen = {_cycle_key(json.loads(line)) for line in sealed}
+    fresh = []
+    for line in new_lines:
+        key = _cycle_key(json.loads(line))
+        if key not in seen:
+            seen.add(key)
+            fresh.append(line)
+    return sealed, fresh
+
+def compact_log(cycle_file, keep_from):
+    """Rewrite the live log without its first keep_from bytes; only safe while the bot is stopped
+
+    The bot keeps appending to whatever inode it has open, so this refuses
+    to swap the file in if the log grew while its tail was being copied.
+    That only catches writes during the copy, not after the swap, which is
+    why the nightly run never compacts.
+    """
+    tmp_path = f"{cycle_file}.compact.tmp"
+    with open(cycle_file, 'rb') as old:
+        old.seek(keep_from)
+        with open(tmp_path, 'wb') as new:
+            shutil.copyfileobj(old, new)
+            copied = old.tell()
+            new.flush()
+            os.fsync(new.fileno())
+        if os.fstat(old.fileno()).st_size != copied:
+            os.remove(tmp_path)
+            raise RuntimeError("Cycle log grew during compaction - stop the bot and retry")
+        shutil.copymode(cycle_file, tmp_path)
+        os.replace(tmp_path, cycle_file)
+    return copied - keep_from
+
+def roll_segments(cycle_file, segments_dir=None, before=None, compact=False):
+    """Seal every day before `before` (default: today) into segments; returns the dates written
+
+    Only the live log past the manifest's sealed offset is scanned. Lines
+    for a day that is already sealed (stragglers, or a rotated log being
+    re-read) are merged into its segment without duplicating rows. The live
+    log is left untouched unless compact=True (see compact_log and the
+    module docstring for running it).
+    """
+    segments_dir = segments_dir or default_segments_dir(cycle_file)
+    before = before or date.today().isoformat()
+    if not os.path.exists(cycle_file):
+        return []
+
+    manifest = load_manifest(segments_dir)
+    start = sealed_offset(segments_dir, cycle_file, manifest)
+    with open_mapped(cycle_file) as mm:
+        if mm is None:
+            return []
+        days, keep_from = _split_sealable(mm, start, before)
+
+    os.makedirs(segments_dir, exist_ok=True)
+    written = []
+    for day in sorted(days):
+        path = os.path.join(segments_dir, f"{day}{SEGMENT_SUFFIX}")
+        sealed, fresh = _merge_lines(path, days[day]) if day in manifest['segments'] else ([], days[day])
+        if not fresh:
+            continue
+        entry = manifest['segments'][day] = write_segment(path, sealed + fresh)
+        written.append(day)
+        print(f"📦 Sealed {day}: {entry['rows']} cycles, {entry['raw_bytes']:,} -> {entry['bytes']:,} bytes")
+
+    manifest['log'] = file_identity(cycle_file)
+    manifest['log']['offset'] = keep_from
+    save_manifest(segments_dir, manifest)
+
+    if compact and keep_from:
+        kept = compact_log(cycle_file, keep_from)
+        manifest['log'] = file_identity(cycle_file)
+        manifest['log']['offset'] = 0
+        save_manifest(segments_dir, manifest)
+        print(f"✂️ Live log trimmed to {kept:,} bytes")
+    elif keep_from:
+        print(f"💡 {keep_from / 1024 / 1024:.1f} MB of the live log is sealed; "
+              f"stop the bot and run `log_segments.py roll --compact` to reclaim it")
+    return written
+
+def main():
+    """Seal finished days or list the segment manifest"""
+    parser = argparse.ArgumentParser(description="Cycle log segment manager")
+    parser.add_argument('--log', default=DEFAULT_LOG)
+    parser.add_argument('--segments-dir')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    roll = sub.add_parser('roll', help='Seal finished days into segments')
+    roll.add_argument('--before', help='Seal days before this YYYY-MM-DD (default: today)')
+    roll.add_argument('--compact', action='store_true',
+                      help='Also drop sealed lines from the live log (stop the bot first)')
+
+    sub.add_parser('list', help='Show the manifest')
+    args = parser.parse_args()
+
+    segments_dir = args.segments_dir or default_segments_dir(args.log)
+    if args.command == 'roll':
+        sealed = roll_segments(args.log, segments_dir, args.before, compact=args.compact)
+        print(f"✅ {len(sealed)} day(s) sealed into {segments_dir}/")
+        return
+
+    manifest = load_manifest(segments_dir)
+    total_raw = total = 0
+    for day, entry in sorted(manifest['segments'].items()):
+        total_raw += entry['raw_bytes']
+        total += entry['bytes']
+        print(f"{day}  {entry['rows']:7d} rows  {entry['frames']:3d} frames  "
+              f"{entry['raw_bytes'] / 1024 / 1024:7.1f} MB -> {entry['bytes'] / 1024 / 1024:6.1f} MB")
+    if total:
+        print(f"📊 {len(manifest['segments'])} segments, {total_raw / total:.1f}x smaller than raw JSONL")
+    if manifest.get('log'):
+        print(f"📍 Live log sealed up to byte {manifest['log']['offset']:,}")
+
+if __name__ == "__main__":
+    main()
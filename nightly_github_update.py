@@ -4,35 +4,80 @@ Nightly GitHub Update Script for BTC Trading Journal
 Runs at 11:30 PM ET to commit daily trading data
 """
 
+import argparse
+import heapq
+import itertools
 import subprocess
 import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 import pytz
 
+from aggregates import RunningDelta, StoreCache, apply_day, commit_summary, day_delta, load_store, save_store, update_readme
+from build_cache import BuildCache, cycles_fingerprint, fingerprint
+from cycle_archive import ARCHIVE_FORMAT, ARCHIVE_SUFFIX, write_cycle_archive
+from cycle_index import update_index
+from cycle_log import LogTailer, day_partitions, open_mapped, read_cycles_between, read_cycles_for_date, scan_cycles_for_date
+from cycle_record import Cycle
+from edge_classifier import classify
+from log_segments import read_sealed_day, roll_segments
+from positions import DEFAULT_POSITION_SIZE_MAX, PositionBook, fold_positions
+from price_bars import BARS_DIR, DayBars, bars_path, market_conditions
+from run_trace import RUNS_DIR, RunTrace
+from settlement import SettlementCache, format_pnl, load_settlements, settle_trades, summarize
+from side_effects import SideEffect, run_side_effects
+from trade_ledger import LEDGER_DIR, append_trades, ledger_paths
+
 eastern = pytz.timezone('US/Eastern')
 REPO_PATH = "/home/ubuntu/clawd/kalshi-btc-trading"
 BTC_BOT_PATH = "/home/ubuntu/clawd/kalshi-bot"
+CYCLE_LOG_FILE = f"{BTC_BOT_PATH}/btc_cycle_log.jsonl"
+CHECKPOINT_FILE = f"{BTC_BOT_PATH}/.btc_cycle_log.checkpoint.json"
+SEGMENTS_DIR = f"{BTC_BOT_PATH}/btc_cycle_segments"  # Sealed past days, see log_segments.py
+THRESHOLDS_FILE = f"{REPO_PATH}/config/current_thresholds.json"
+SETTLEMENTS_FILE = f"{BTC_BOT_PATH}/market_settlements.jsonl"
+AGGREGATES_FILE = "analytics/aggregates.json"  # Relative to REPO_PATH, like LEDGER_DIR
+DAY_WINDOW_SLACK = 3600  # Seconds of padding around a day's window; timestamps are bot-local
+WHATSAPP_TO = '+12318186017'
+GIT_TIMEOUT = 60  # Seconds for local git add/commit
+PUSH_TIMEOUT = 120  # Per push attempt
+NOTIFY_TIMEOUT = 30  # Per clawdbot attempt
+FOLLOW_DEBOUNCE = 30.0  # Seconds between data.json republishes in --follow mode
+REPORT_DETAIL_LIMIT = 10  # Positions written up in full
+REPORT_TABLE_LIMIT = 200  # Further positions listed as table rows
+REPORT_FORMAT = 2  # Bump when the report layout changes so cached reports are rebuilt
+
+def day_window(target_date):
+    """Return the [start, end) unix_time range of an ET calendar day"""
+    day = datetime.strptime(target_date, '%Y-%m-%d')
+    start = eastern.localize(day)
+    end = eastern.localize(day + timedelta(days=1))
+    return int(start.timestamp()), int(end.timestamp())
 
 def get_todays_cycles(target_date):
     """Extract today's trading cycles from bot logs"""
     try:
-        cycle_file = f"{BTC_BOT_PATH}/btc_cycle_log.jsonl"
-        if not os.path.exists(cycle_file):
+        cycle_file = CYCLE_LOG_FILE
+        sealed = read_sealed_day(SEGMENTS_DIR, cycle_file, target_date)
+        if sealed is not None:
+            cycles = sealed  # Sealed day: its segment plus stragglers past the sealed offset
+        elif not os.path.exists(cycle_file):
             return {"date": target_date, "total_cycles": 0, "cycles": []}
-        
-        cycles = []
-        with open(cycle_file, 'r') as f:
-            for line in f:
-                try:
-                    cycle = json.loads(line.strip())
-                    cycle_date = cycle.get('timestamp', '')[:10]  # YYYY-MM-DD
-                    
-                    if cycle_date == target_date:
-                        cycles.append(cycle)
-                except:
-                    continue
+        elif target_date < date.today().isoformat():
+            # Past day (backfill / re-report): seek straight to its window
+            start_unix, end_unix = day_window(target_date)
+            cycles = [
+                cycle for cycle in read_cycles_between(
+                    cycle_file, start_unix - DAY_WINDOW_SLACK, end_unix + DAY_WINDOW_SLACK
+                )
+                if cycle.get('timestamp', '')[:10] == target_date
+            ]
+        else:
+            cycles = read_cycles_for_date(cycle_file, target_date, CHECKPOINT_FILE)
         
         return {
             "date": target_date,
@@ -43,122 +88,345 @@ def get_todays_cycles(target_date):
         print(f"Error getting cycles: {e}")
         return {"date": target_date, "total_cycles": 0, "cycles": []}
 
+def load_thresholds():
+    """Active trading parameters from config/current_thresholds.json"""
+    try:
+        with open(THRESHOLDS_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load thresholds, using defaults: {e}")
+        return {}
+
+def extract_trades(target_date, cycles, size_max=None):
+    """Fold already-parsed Cycle records into one trade per position
+    
+    Repeated same-side BUY signals on a market window become a single trade
+    with fill count, VWAP entry and first/last signal times.
+    """
+    if size_max is None:
+        size_max = load_thresholds().get('position_size_max', DEFAULT_POSITION_SIZE_MAX)
+    return position_trades(target_date, fold_positions(cycles, size_max))
+
+def position_trades(target_date, positions):
+    """Trade records for folded positions, numbered in order of first signal"""
+    return [position_trade(target_date, number, position) for number, position in enumerate(positions, 1)]
+
+def position_trade(target_date, number, position):
+    """Trade record for one folded position; number is its 1-based place in the day"""
+    first, last = position.first, position.last
+    
+    # Edge type and numeric fields from the reasoning template
+    reasoning = first.reasoning
+    edge_type, _, reasoning_fields = classify(reasoning)
+    
+    return {
+        "trade_id": f"{target_date.replace('-', '')}{number:03d}",
+        "date": target_date,
+        "timestamp": first.timestamp,
+        "market_ticker": position.market_ticker,
+        "edge_type": edge_type,
+        "side": position.side,
+        "price_paid": position.vwap,
+        "time_remaining": first.time_remaining,
+        "claude_reasoning": reasoning,
+        "reasoning_fields": reasoning_fields,
+        "market_result": last.outcome.lower() if last.outcome else 'pending',
+        "close_time": position.close_time,
+        "signals": position.signals,
+        "fills": position.fills,
+        "size": position.size,
+        "last_signal": last.timestamp
+    }
+
 def get_todays_trades(target_date):
     """Extract executed trades from today's cycles"""
-    cycle_data = get_todays_cycles(target_date)
-    trades = []
-    
-    trade_counter = 1
-    for cycle in cycle_data.get('cycles', []):
-        if cycle.get('decision', '').startswith('BUY_'):
-            # Parse edge type from reasoning
-            reasoning = cycle.get('reasoning', '')
-            edge_type = "unknown"
-            if "[LATE_WINDOW_LOCK]" in reasoning:
-                edge_type = "late_window_lock"
-            elif "[SPEED_ADVANTAGE]" in reasoning:
-                edge_type = "speed_advantage"  
-            elif "[VOLATILITY_MISPRICING]" in reasoning:
-                edge_type = "volatility_mispricing"
-            
-            trade = {
-                "trade_id": f"{target_date.replace('-', '')}{trade_counter:03d}",
-                "date": target_date,
-                "timestamp": cycle.get('timestamp'),
-                "market_ticker": cycle.get('market_ticker'),
-                "edge_type": edge_type,
-                "side": cycle.get('decision', '').replace('BUY_', '').lower(),
-                "price_paid": float(cycle.get('yes_ask', 0)) if 'YES' in cycle.get('decision', '') else float(cycle.get('no_ask', 0)),
-                "time_remaining": cycle.get('time_remaining', 0),
-                "claude_reasoning": cycle.get('reasoning', ''),
-                "market_result": cycle.get('outcome', 'pending').lower() if cycle.get('outcome') else 'pending'
-            }
-            trades.append(trade)
-            trade_counter += 1
-    
-    return trades
-
-def generate_daily_report(target_date):
-    """Generate human-readable daily report"""
-    cycles = get_todays_cycles(target_date)
-    trades = get_todays_trades(target_date)
+    cycles = [Cycle.from_dict(c) for c in get_todays_cycles(target_date).get('cycles', [])]
+    return extract_trades(target_date, cycles)
+
+@dataclass
+class DayContext:
+    """One day's cycles, derived trades and aggregates, built in a single log pass
+    
+    cycles holds typed Cycle records (integer-cent prices), parsed once.
+    """
+    date: str
+    cycles: list = field(default_factory=list)
+    trades: list = field(default_factory=list)
+    pnl: dict = field(default_factory=dict)
+    bars: DayBars = None
+    
+    @property
+    def total_cycles(self):
+        return len(self.cycles)
+    
+    @property
+    def executed_trades(self):
+        return len(self.trades)
     
-    total_cycles = cycles.get('total_cycles', 0)
-    executed_trades = len(trades)
-    skips = total_cycles - executed_trades
-    skip_rate = (skips / total_cycles * 100) if total_cycles > 0 else 0
+    @property
+    def signals(self):
+        """Raw BUY signals before folding into positions"""
+        return sum(1 for cycle in self.cycles if cycle.is_buy)
     
-    # Count wins/losses from completed trades
-    wins = len([t for t in trades if t.get('market_result') == 'yes' and t.get('side') == 'yes']) + \
-           len([t for t in trades if t.get('market_result') == 'no' and t.get('side') == 'no'])
-    losses = executed_trades - wins
+    @property
+    def skips(self):
+        return self.total_cycles - self.signals
     
-    report = f"""# Trading Report — {target_date}
+    @property
+    def skip_rate(self):
+        return (self.skips / self.total_cycles * 100) if self.total_cycles > 0 else 0
+    
+    @property
+    def edge_types(self):
+        return set(trade.get('edge_type', 'unknown') for trade in self.trades)
+    
+    @property
+    def cycle_data(self):
+        """Dashboard cycle_data without the cycle list (the dashboard only needs counts)"""
+        return {"date": self.date, "total_cycles": self.total_cycles, "buy_signals": self.signals, "cycles": []}
+
+@dataclass
+class LiveDay:
+    """Running counters, positions, settled trades and bars for --follow; each cycle is folded in O(1)"""
+    date: str
+    book: PositionBook
+    bars: DayBars = None
+    total_cycles: int = 0
+    signals: int = 0
+    last_timestamp: str = ''
+    last_ids: set = field(default_factory=set)  # cycle_ids already folded in at last_timestamp
+    trades: list = field(default_factory=list)  # Settled trade per position, as of the last refresh()
+    tally: RunningDelta = field(default_factory=RunningDelta)  # Aggregates delta of `trades`
+    numbers: dict = field(default_factory=dict)  # Position -> its index in book.positions / trades
+    touched: dict = field(default_factory=dict)  # Positions folded into since the last refresh(), in order
+    settled_with: dict = None  # Settlement table `trades` were settled against
+    
+    def __post_init__(self):
+        if self.bars is None:
+            self.bars = DayBars(self.date)
+    
+    def add(self, cycle):
+        """Fold in one cycle; False if it was already seen (the log is re-read after a segment roll)"""
+        if cycle.timestamp < self.last_timestamp or (
+                cycle.timestamp == self.last_timestamp and cycle.cycle_id in self.last_ids):
+            return False
+        if cycle.timestamp != self.last_timestamp:
+            self.last_timestamp = cycle.timestamp
+            self.last_ids = set()
+        self.last_ids.add(cycle.cycle_id)
+        
+        self.total_cycles += 1
+        self.bars.add(cycle)
+        position = self.book.add(cycle)
+        if position is not None:
+            self.signals += 1
+            self.numbers.setdefault(position, len(self.numbers))
+            self.touched[position] = None
+        return True
+    
+    def refresh(self, settlements):
+        """Rebuild and settle only the trades whose positions changed since the last call; returns all trades
+        
+        A new settlement table (the file changed) re-settles every trade.
+        """
+        if settlements is not self.settled_with:
+            self.settled_with = settlements
+            self.touched = dict.fromkeys(self.book.positions)
+        positions = list(self.touched)
+        self.touched = {}
+        fresh = settle_trades([position_trade(self.date, self.numbers[p] + 1, p) for p in positions], settlements)
+        for position, trade in zip(positions, fresh):
+            number = self.numbers[position]
+            if number < len(self.trades):
+                self.tally.replace(self.trades[number], trade)
+                self.trades[number] = trade
+            else:
+                self.tally.replace(None, trade)
+                self.trades.append(trade)
+        return self.trades
+    
+    @property
+    def bars_key(self):
+        """Build-cache key for the bars shard that only changes when a new minute bar opens"""
+        return fingerprint("live bars", self.date, len(self.bars.minutes))
+    
+    @property
+    def cycle_data(self):
+        """Dashboard cycle_data without the cycle list (the dashboard only needs counts)"""
+        return {"date": self.date, "total_cycles": self.total_cycles, "buy_signals": self.signals, "cycles": []}
+
+def day_keys(ctx):
+    """Build-cache input hashes for a day's report and cycle archive"""
+    cycles_key = cycles_fingerprint(ctx.cycles)
+    return {
+        "report": fingerprint("report", REPORT_FORMAT, cycles_key, ctx.trades, REPORT_DETAIL_LIMIT, REPORT_TABLE_LIMIT),
+        "archive": fingerprint("archive", ARCHIVE_FORMAT, cycles_key),
+        "bars": fingerprint("bars", cycles_key),
+    }
+
+def make_day_context(target_date, cycles, size_max=None, settlements=None):
+    """Fold cycles into trades, settle them and summarize P/L"""
+    if settlements is None:
+        settlements = load_settlements(SETTLEMENTS_FILE)
+    trades = settle_trades(extract_trades(target_date, cycles, size_max), settlements)
+    return DayContext(
+        date=target_date,
+        cycles=cycles,
+        trades=trades,
+        pnl=summarize(trades),
+        bars=DayBars.from_cycles(target_date, cycles)
+    )
+
+def save_day_bars(ctx, cache, key):
+    """Write analytics/bars/{date}.bars unless fresh; returns (path, changed)"""
+    path = bars_path(BARS_DIR, ctx.date)
+    if cache.fresh(path, key):
+        return path, False
+    path, changed = ctx.bars.save(BARS_DIR)
+    cache.record(path, key)
+    return path, changed
+
+def build_day_context(target_date):
+    """Read the cycle log once and derive everything the nightly stages need"""
+    cycles = [Cycle.from_dict(c) for c in get_todays_cycles(target_date).get('cycles', [])]
+    return make_day_context(target_date, cycles)
+
+def report_summary(ctx):
+    """Report header and summary table (also what the WhatsApp message is built from)"""
+    pnl = ctx.pnl or summarize(ctx.trades)
+    return f"""# Trading Report — {ctx.date}
 
 ## Summary
 
 | Metric | Value |
 |--------|-------|
-| Cycles Monitored | {total_cycles} |
-| Trades Executed | {executed_trades} |
-| Wins | {wins} |
-| Losses | {losses} |
-| Skips | {skips} |
-| Skip Rate | {skip_rate:.1f}% |
-
-## Trades
+| Cycles Monitored | {ctx.total_cycles} |
+| Buy Signals | {ctx.signals} |
+| Trades Executed | {ctx.executed_trades} |
+| Wins | {pnl['wins']} |
+| Losses | {pnl['losses']} |
+| Pending | {pnl['pending']} |
+| Win Rate | {pnl['win_rate']:.1f}% |
+| Total P/L | {format_pnl(pnl['total_pnl'])} |
+| Best Trade | {format_pnl(pnl['best_trade'])} |
+| Worst Trade | {format_pnl(pnl['worst_trade'])} |
+| Skips | {ctx.skips} |
+| Skip Rate | {ctx.skip_rate:.1f}% |
 
 """
-    
-    if executed_trades > 0:
-        for i, trade in enumerate(trades, 1):
-            result_icon = "✅ WIN" if trade.get('market_result') in ['yes', 'no'] else "⏳ PENDING"
-            if trade.get('market_result') == 'yes' and trade.get('side') == 'no':
-                result_icon = "❌ LOSS"
-            elif trade.get('market_result') == 'no' and trade.get('side') == 'yes':
-                result_icon = "❌ LOSS"
-            
-            timestamp_short = trade.get('timestamp', '')[:16] if trade.get('timestamp') else ''
-            
-            report += f"""### Trade #{i} — {timestamp_short}
-{result_icon}
+
+def _result_icon(trade):
+    if trade.get('market_result') not in ('yes', 'no'):
+        return "⏳ PENDING"
+    return "✅ WIN" if trade.get('market_result') == trade.get('side') else "❌ LOSS"
+
+def _trade_pnl(trade):
+    return format_pnl(trade['pnl']) if trade.get('pnl') is not None else 'pending'
+
+def _trade_detail(i, trade):
+    timestamp_short = trade.get('timestamp', '')[:16] if trade.get('timestamp') else ''
+    return f"""### Trade #{i} — {timestamp_short}
+{_result_icon(trade)}
 - **Market**: {trade.get('market_ticker')}
 - **Edge**: {trade.get('edge_type', 'unknown').replace('_', ' ').title()}
 - **Side**: {trade.get('side', '').upper()} @ ${trade.get('price_paid', 0):.2f}
+- **Fills**: {trade.get('fills', 1)} of {trade.get('signals', 1)} signals, size {trade.get('size', 1):g}
 - **Time remaining**: {trade.get('time_remaining', 0):.1f}m
+- **P/L**: {format_pnl(trade['pnl']) if trade.get('pnl') is not None else 'pending settlement'}
 - **Reasoning**: {trade.get('claude_reasoning', '')[:150]}...
 
 """
+
+def _trade_row(i, trade):
+    return (f"| {i} | {trade.get('timestamp', '')[11:16]} | {trade.get('market_ticker')} | "
+            f"{trade.get('side', '').upper()} | ${trade.get('price_paid', 0):.2f} | "
+            f"{trade.get('fills', 1)}/{trade.get('signals', 1)} | {_trade_pnl(trade)} | {_result_icon(trade)} |\n")
+
+def _position_weight(item):
+    """Rank positions for full detail: biggest settled P/L swing, then most fills"""
+    _, trade = item
+    return (abs(trade.get('pnl') or 0), trade.get('fills', 1))
+
+def iter_daily_report(ctx, detail_limit=REPORT_DETAIL_LIMIT, table_limit=REPORT_TABLE_LIMIT):
+    """Yield the daily report section by section
+    
+    The top detail_limit positions get full write-ups, the next table_limit
+    go into a compact table and anything beyond is only counted, so output
+    stays bounded however many signals the day had.
+    """
+    trades = ctx.trades
+    total_cycles = ctx.total_cycles
+    
+    yield report_summary(ctx)
+    yield "## Trades\n\n"
+    
+    if trades:
+        detailed = set(i for i, _ in heapq.nlargest(detail_limit, enumerate(trades, 1), key=_position_weight))
+        for i, trade in enumerate(trades, 1):
+            if i in detailed:
+                yield _trade_detail(i, trade)
+        
+        remaining = len(trades) - len(detailed)
+        if remaining > 0:
+            yield f"""### Other Positions ({remaining})
+
+| # | Time | Market | Side | VWAP | Fills | P/L | Result |
+|---|------|--------|------|------|-------|-----|--------|
+"""
+            rest = (item for item in enumerate(trades, 1) if item[0] not in detailed)
+            for i, trade in itertools.islice(rest, table_limit):
+                yield _trade_row(i, trade)
+            if remaining > table_limit:
+                yield (f"\n*…and {remaining - table_limit} more positions; full list: "
+                       f"`python3 trade_ledger.py show --date {ctx.date}`*\n")
+            yield "\n"
     else:
-        report += "No trades executed today. System correctly identified lack of mathematical edges.\n\n"
+        yield "No trades executed today. System correctly identified lack of mathematical edges.\n\n"
     
     # Add market analysis
     if total_cycles > 0:
-        report += f"""## Market Analysis
+        yield f"""## Market Analysis
 
 - **Total market cycles analyzed**: {total_cycles}
-- **Edge detection rate**: {(executed_trades/total_cycles*100):.1f}% of cycles had detectable edges
-- **Selectivity working correctly**: {skip_rate:.1f}% skip rate indicates proper patience
+- **Edge detection rate**: {(ctx.signals/total_cycles*100):.1f}% of cycles had detectable edges
+- **Selectivity working correctly**: {ctx.skip_rate:.1f}% skip rate indicates proper patience
+
+"""
+        
+        # Spread/overround per market series from the window bars, not the raw snapshots
+        conditions = market_conditions(ctx.bars) if ctx.bars else {}
+        if conditions:
+            yield """## Market Conditions
 
-## Notable Skips
+*Per 15-minute window, from the YES ask bars (cents)*
+
+| Series | Windows | Avg Range | Avg Spread | Avg Overround |
+|--------|---------|-----------|------------|---------------|
+"""
+            for name, stats in conditions.items():
+                yield (f"| {name} | {stats['windows']} | {stats['avg_range']:.1f}¢ | "
+                       f"{stats['avg_spread']:.1f}¢ | {stats['avg_overround']:+.1f}¢ |\n")
+            yield "\n"
+        
+        yield """## Notable Skips
 
 *Analysis of significant opportunities that were passed on*
 
 """
         
         # Find high-confidence skips
-        significant_skips = []
-        for cycle in cycles.get('cycles', []):
-            if cycle.get('decision') == 'SKIP' and ('EDGE' in cycle.get('reasoning', '') or 'confidence' in cycle.get('reasoning', '')):
-                significant_skips.append(cycle)
-        
-        if significant_skips:
-            for skip in significant_skips[:3]:  # Top 3 notable skips
-                report += f"- **{skip.get('timestamp', '')[:11]}**: {skip.get('reasoning', '')[:100]}...\n"
+        significant_skips = (
+            cycle for cycle in ctx.cycles
+            if cycle.decision == 'SKIP' and ('EDGE' in cycle.reasoning or 'confidence' in cycle.reasoning)
+        )
+        notable = list(itertools.islice(significant_skips, 3))  # Top 3 notable skips
+        if notable:
+            for skip in notable:
+                yield f"- **{skip.timestamp[:11]}**: {skip.reasoning[:100]}...\n"
         else:
-            report += "- No significant edge opportunities were declined today\n"
+            yield "- No significant edge opportunities were declined today\n"
     
-    report += f"""
+    yield f"""
 
 ## System Performance
 
@@ -168,15 +436,27 @@ def generate_daily_report(target_date):
 - **Risk controls engaged**: ✅
 
 """
-    
-    return report
 
-def get_claude_daily_review(cycles, trades):
+def write_daily_report(ctx, f, **limits):
+    """Stream the report into an open file; returns (lines, characters) written"""
+    lines = chars = 0
+    for chunk in iter_daily_report(ctx, **limits):
+        f.write(chunk)
+        lines += chunk.count("\n")
+        chars += len(chunk)
+    return lines, chars
+
+def generate_daily_report(ctx, **limits):
+    """Generate human-readable daily report"""
+    return "".join(iter_daily_report(ctx, **limits))
+
+def get_claude_daily_review(ctx):
     """Generate Claude analysis of the day's performance"""
     try:
-        total_cycles = len(cycles.get('cycles', []))
-        executed_trades = len(trades)
-        skip_rate = ((total_cycles - executed_trades) / total_cycles * 100) if total_cycles > 0 else 0
+        total_cycles = ctx.total_cycles
+        executed_trades = ctx.executed_trades
+        skip_rate = ctx.skip_rate
+        pnl = ctx.pnl or summarize(ctx.trades)
         
         analysis = f"""## Claude End-of-Day Analysis
 
@@ -189,7 +469,8 @@ def get_claude_daily_review(cycles, trades):
 **Edge Detection Summary**:
 - Total opportunities analyzed: {total_cycles}
 - Mathematical edges identified: {executed_trades}
-- Edge detection rate: {(executed_trades/total_cycles*100) if total_cycles > 0 else 0:.1f}%
+- Edge detection rate: {(ctx.signals/total_cycles*100) if total_cycles > 0 else 0:.1f}%
+- Settled P/L: {format_pnl(pnl['total_pnl'])} ({pnl['wins']}W / {pnl['losses']}L, {pnl['pending']} pending)
 
 **Observations**:
 """
@@ -199,7 +480,7 @@ def get_claude_daily_review(cycles, trades):
 - Market conditions likely lacked the volatility patterns required for profitable edges
 - System correctly prioritized capital preservation over forced trading"""
         else:
-            edge_types = set(trade.get('edge_type', 'unknown') for trade in trades)
+            edge_types = ctx.edge_types
             analysis += f"""- {executed_trades} trade(s) executed using {len(edge_types)} different edge type(s)
 - Edge types utilized: {', '.join(edge_types)}
 - System demonstrated selective activation when mathematical advantages present"""
@@ -219,37 +500,70 @@ def get_claude_daily_review(cycles, trades):
     except Exception as e:
         return f"## Claude Analysis Error\n\nUnable to generate daily analysis: {e}"
 
-def update_readme_dashboard(repo_path):
-    """Update README with latest performance metrics"""
+def update_aggregates(ctx, store=None):
+    """Fold one day's delta into the all-time aggregates store and persist it"""
+    if store is None:
+        store = load_store(AGGREGATES_FILE)
+    apply_day(store, ctx.date, day_delta(ctx.total_cycles, ctx.signals, ctx.trades, ctx.pnl))
+    save_store(AGGREGATES_FILE, store)
+    return store
+
+def update_readme_dashboard(repo_path, store):
+    """Update README with latest performance metrics; returns True if the file changed"""
     try:
         readme_path = f"{repo_path}/README.md"
-        if os.path.exists(readme_path):
-            with open(readme_path, 'r') as f:
-                content = f.read()
-            
-            # Update timestamp
-            updated_content = content.replace(
-                "Last updated: 2026-02-10T08:42:00",
-                f"Last updated: {datetime.now().isoformat()}"
-            )
-            
-            with open(readme_path, 'w') as f:
-                f.write(updated_content)
+        changed = os.path.exists(readme_path) and update_readme(readme_path, store)
                 
-        print("✅ README dashboard updated")
+        print("✅ README dashboard updated" if changed else "✅ README dashboard unchanged")
+        return changed
     except Exception as e:
         print(f"⚠️ README update error: {e}")
+        return False
 
-def send_whatsapp_daily_summary(daily_report):
-    """Send daily summary via WhatsApp"""
-    try:
-        # Extract key metrics for summary
-        lines = daily_report.split('\n')
-        cycles = next((line for line in lines if 'Cycles Monitored' in line), 'Unknown').split('|')[1].strip()
-        trades = next((line for line in lines if 'Trades Executed' in line), 'Unknown').split('|')[1].strip()
-        skip_rate = next((line for line in lines if 'Skip Rate' in line), 'Unknown').split('|')[1].strip()
-        
-        summary = f"""📊 **Daily Trading Journal Updated**
+def commit_paths(paths, message, riders=()):
+    """Stage exactly these paths and commit; returns False when nothing changed
+    
+    Only the listed files are stat'ed, so commit time tracks the day's output
+    rather than the size of the working tree. Files still staged from a run
+    whose commit failed are included: the build cache already counts them as
+    fresh, so they would otherwise never be listed again. Riders (the run
+    trace) go into a commit that happens anyway but never cause one.
+    """
+    leftover = subprocess.run(["git", "diff", "--cached", "--name-only"], capture_output=True,
+                              text=True, check=True, timeout=GIT_TIMEOUT).stdout.split()
+    existing = sorted(set(p for p in paths if os.path.exists(p)))
+    paths = sorted(set(existing) | set(leftover))
+    if not paths:
+        return False
+    if existing:
+        subprocess.run(["git", "add", "--", *existing], check=True, timeout=GIT_TIMEOUT)
+    staged = subprocess.run(["git", "diff", "--cached", "--quiet", "--", *paths], timeout=GIT_TIMEOUT)
+    if staged.returncode == 0:
+        return False
+    riders = sorted(set(p for p in riders if os.path.exists(p)) - set(paths))
+    if riders:
+        subprocess.run(["git", "add", "--", *riders], check=True, timeout=GIT_TIMEOUT)
+    subprocess.run(["git", "commit", "-m", message, "--", *paths, *riders], check=True, timeout=GIT_TIMEOUT)
+    return True
+
+def whatsapp_command(message):
+    """clawdbot invocation that delivers one WhatsApp message"""
+    return [
+        'clawdbot', 'message', 'send',
+        '--channel', 'whatsapp',
+        '--to', WHATSAPP_TO,
+        '--message', message
+    ]
+
+def whatsapp_daily_summary(daily_report):
+    """WhatsApp summary text (needs at least the report's summary table)"""
+    # Extract key metrics for summary
+    lines = daily_report.split('\n')
+    cycles = next((line for line in lines if 'Cycles Monitored' in line), 'Unknown').split('|')[1].strip()
+    trades = next((line for line in lines if 'Trades Executed' in line), 'Unknown').split('|')[1].strip()
+    skip_rate = next((line for line in lines if 'Skip Rate' in line), 'Unknown').split('|')[1].strip()
+    
+    return f"""📊 **Daily Trading Journal Updated**
 
 🔍 **Cycles Analyzed**: {cycles}
 🎯 **Trades Executed**: {trades}  
@@ -258,14 +572,13 @@ def send_whatsapp_daily_summary(daily_report):
 📂 **Full Report**: kalshi-btc-trading/daily/{date.today().isoformat()}.md
 
 The complete day's analysis has been committed to your private GitHub repository with Claude's performance assessment."""
-        
+
+def send_whatsapp_daily_summary(daily_report):
+    """Send daily summary via WhatsApp"""
+    try:
         # Send via clawdbot message tool
-        result = subprocess.run([
-            'clawdbot', 'message', 'send',
-            '--channel', 'whatsapp',
-            '--to', '+12318186017',
-            '--message', summary
-        ], capture_output=True, text=True)
+        result = subprocess.run(whatsapp_command(whatsapp_daily_summary(daily_report)),
+                                capture_output=True, text=True, timeout=NOTIFY_TIMEOUT)
         
         if result.returncode == 0:
             print("✅ WhatsApp daily summary sent")
@@ -275,7 +588,7 @@ The complete day's analysis has been committed to your private GitHub repository
     except Exception as e:
         print(f"⚠️ WhatsApp summary error: {e}")
 
-def main():
+def main(trace_memory=False):
     """Main nightly update function"""
     today = date.today().isoformat()
     
@@ -286,76 +599,136 @@ def main():
         print(f"❌ Repository path not found: {REPO_PATH}")
         return
     
+    trace = RunTrace(today, trace_memory=trace_memory)
+    changed_paths = []  # Everything this run changed; only these get staged
+    report = None
     try:
         os.chdir(REPO_PATH)
+        cache = BuildCache()
         
-        # 1. Generate daily report
+        # 0. Seal finished days into segments, then read today's cycles once; every stage below shares this context
+        print("📖 Reading cycle log...")
+        with trace.span("0 read cycle log") as span:
+            try:
+                span.count(sealed_days=len(roll_segments(CYCLE_LOG_FILE, SEGMENTS_DIR, before=today)))
+            except OSError as e:
+                print(f"⚠️ Could not roll cycle log segments: {e}")
+            ctx = build_day_context(today)
+            cycle_data = ctx.cycle_data
+            trades = ctx.trades
+            span.count(lines=ctx.total_cycles, trades=ctx.executed_trades)
+            if os.path.exists(CYCLE_LOG_FILE):
+                span.count(log_bytes=os.path.getsize(CYCLE_LOG_FILE))  # Scanned via mmap, so not in io_read
+                span.count(indexed=update_index(CYCLE_LOG_FILE, segments_dir=SEGMENTS_DIR))  # Only lines appended since the last run
+        
+        keys = day_keys(ctx)
+        
+        # 1. Generate daily report into a temp file; it replaces daily/{today}.md after stage 5
         print("📝 Generating daily report...")
-        daily_report = generate_daily_report(today)
-        daily_file = f"daily/{today}.md"
-        with open(daily_file, "w") as f:
-            f.write(daily_report)
-        print(f"✅ Daily report created: {daily_file}")
+        with trace.span("1 daily report") as span:
+            daily_file = f"daily/{today}.md"
+            report = cache.open(daily_file, keys['report'])
+            if report is not None:
+                report_lines, report_chars = write_daily_report(ctx, report.file)
+                span.count(lines=report_lines, chars_written=report_chars)
+        print(f"✅ Daily report rendered: {daily_file}" if report else f"✅ Daily report unchanged: {daily_file}")
         
         # 2. Save cycle data
         print("💾 Saving cycle data...")
-        cycle_data = get_todays_cycles(today)
-        cycle_file = f"cycles/{today}_cycles.json"
-        with open(cycle_file, "w") as f:
-            json.dump(cycle_data, f, indent=2)
-        print(f"✅ Cycle data saved: {cycle_file}")
+        with trace.span("2 cycle archive") as span:
+            cycle_file = f"cycles/{today}{ARCHIVE_SUFFIX}"
+            if cache.fresh(cycle_file, keys['archive']):
+                print(f"✅ Cycle data unchanged: {cycle_file}")
+            else:
+                archive_bytes = write_cycle_archive(cycle_file, today, ctx.cycles)
+                cache.record(cycle_file, keys['archive'])
+                changed_paths.append(cycle_file)
+                span.count(lines=ctx.total_cycles, bytes_written=archive_bytes)
+                print(f"✅ Cycle data saved: {cycle_file} ({archive_bytes:,} bytes)")
+            
+            bars_file, bars_changed = save_day_bars(ctx, cache, keys['bars'])
+            if bars_changed:
+                changed_paths.append(bars_file)
+                print(f"✅ Price bars saved: {bars_file} ({len(ctx.bars.minutes)} minute bars)")
         
-        # 3. Save trade JSONs
+        # 3. Append trades to the monthly ledger (per-trade JSON via trade_ledger.py export)
         print("🎯 Processing trades...")
-        trades = get_todays_trades(today)
-        for trade in trades:
-            trade_file = f"trades/trade_{trade['trade_id']}.json"
-            with open(trade_file, "w") as f:
-                json.dump(trade, f, indent=2)
-        print(f"✅ {len(trades)} trade files saved")
-        
-        # 4. Update README dashboard
+        with trace.span("3 trade ledger") as span:
+            written = append_trades(trades)
+            changed_paths.extend(ledger_paths(trades))
+            span.count(lines=written)
+        print(f"✅ {written} of {len(trades)} trades appended to {LEDGER_DIR}/")
+        
+        # 4. Fold today into the all-time aggregates, then render README from them
         print("📊 Updating README dashboard...")
-        update_readme_dashboard(REPO_PATH)
+        with trace.span("4 aggregates + README"):
+            store = update_aggregates(ctx)
+            changed_paths.append(AGGREGATES_FILE)
+            if update_readme_dashboard(REPO_PATH, store):
+                changed_paths.append("README.md")
         
         # 4b. Update HTML dashboard for website
         print("🌐 Updating website dashboard...")
-        try:
-            import sys
-            sys.path.append(REPO_PATH)
-            from update_dashboard_with_data import update_dashboard_data
-            update_dashboard_data(cycle_data, trades)
-        except Exception as e:
-            print(f"⚠️ Website dashboard update error: {e}")
+        with trace.span("4b website data"):
+            try:
+                import sys
+                sys.path.append(REPO_PATH)
+                from update_dashboard_with_data import update_dashboard_data
+                changed_paths.extend(update_dashboard_data(cycle_data, trades, store, cache=cache, bars=ctx.bars) or [])
+            except Exception as e:
+                print(f"⚠️ Website dashboard update error: {e}")
         
         # 5. Generate Claude analysis
-        print("🧠 Generating Claude analysis...")
-        analysis = get_claude_daily_review(cycle_data, trades)
-        with open(daily_file, "a") as f:
-            f.write(f"\n\n{analysis}\n")
-        print("✅ Claude analysis appended")
+        if report is not None:
+            print("🧠 Generating Claude analysis...")
+            with trace.span("5 Claude analysis") as span:
+                analysis = get_claude_daily_review(ctx)
+                report.file.write(f"\n\n{analysis}\n")
+                span.count(lines=analysis.count("\n") + 1)
+            print("✅ Claude analysis appended")
+            
+            # Stages 0-5 go into the report; git and WhatsApp timings land in runs/ only
+            report.file.write(f"\n{trace.summary_markdown()}\n")
+            if report.commit():
+                changed_paths.append(daily_file)
+            report = None
+            print(f"✅ Daily report written: {daily_file}")
+        cache.save()
         
-        # 6. Git commit and push
+        # 6. Commit locally, then push and send the WhatsApp summary concurrently
         print("📤 Committing to GitHub...")
-        subprocess.run(["git", "add", "."], check=True)
-        
-        pl_summary = f"Cycles: {cycle_data['total_cycles']} | Trades: {len(trades)}"
-        if len(trades) > 0:
-            edge_types = set(t.get('edge_type', 'unknown') for t in trades)
-            pl_summary += f" | Edges: {', '.join(edge_types)}"
-        
-        commit_msg = f"Daily update {today} | {pl_summary}"
-        subprocess.run(["git", "commit", "-m", commit_msg], check=True)
-        subprocess.run(["git", "push", "origin", "main"], check=True)
-        print("✅ Changes committed and pushed to GitHub")
+        with trace.span("6 git commit") as span:
+            pl_summary = f"Cycles: {ctx.total_cycles} | Trades: {ctx.executed_trades} | P/L: {format_pnl(ctx.pnl['total_pnl'])}"
+            if ctx.executed_trades > 0:
+                pl_summary += f" | Edges: {', '.join(ctx.edge_types)}"
+            
+            commit_msg = f"Daily update {today} | {pl_summary} | {commit_summary(store)}"
+            # Last night's timings were appended to runs/ after its commit; they ride along but never force one
+            committed = commit_paths(changed_paths, commit_msg, riders=[RUNS_DIR])
+            span.count(paths=len(set(changed_paths)))
+        print("✅ Changes committed" if committed else "✅ Nothing changed - commit skipped")
         
-        # 7. Send WhatsApp summary
-        print("📱 Sending WhatsApp summary...")
-        send_whatsapp_daily_summary(daily_report)
+        # 7. Push and WhatsApp summary in parallel; a hung push no longer holds up the message
+        print("📱 Pushing and sending WhatsApp summary...")
+        with trace.span("7 push + WhatsApp"):
+            effects = [SideEffect("whatsapp", whatsapp_command(whatsapp_daily_summary(report_summary(ctx))),
+                                  timeout=NOTIFY_TIMEOUT)]
+            if committed:
+                effects.insert(0, SideEffect("git push", ["git", "push", "origin", "main"], timeout=PUSH_TIMEOUT))
+            outcomes = run_side_effects(effects)
+        trace.record(side_effects=outcomes)
+        for outcome in outcomes:
+            if outcome['ok']:
+                print(f"✅ {outcome['name']} done ({outcome['attempts']} attempt(s), {outcome['elapsed_s']:.1f}s)")
+            else:
+                print(f"⚠️ {outcome['name']} failed after {outcome['attempts']} attempt(s): {outcome['error']}")
+        push = outcomes[0]
+        if push['name'] == "git push" and not push['ok']:
+            send_error_notification(f"Git push failed: {push['error']}")
         
         print(f"\n🎯 Nightly update completed successfully for {today}!")
-        print(f"   📊 Analyzed: {cycle_data['total_cycles']} cycles")
-        print(f"   🎯 Executed: {len(trades)} trades")
+        print(f"   📊 Analyzed: {ctx.total_cycles} cycles")
+        print(f"   🎯 Executed: {ctx.executed_trades} trades")
         print(f"   📝 Report: https://github.com/Rromanox/kalshi-btc-trading")
         
     except subprocess.CalledProcessError as e:
@@ -366,18 +739,239 @@ def main():
         error_msg = f"Nightly update failed: {e}"
         print(f"❌ {error_msg}")
         send_error_notification(error_msg)
+    finally:
+        if report is not None:
+            report.discard()  # Never leave a half-written report behind
+        # Committed with the next nightly run
+        try:
+            print(f"⏱️ Run timings saved to {trace.save()} ({trace.to_dict()['total_wall_s']:.1f}s)")
+        except OSError as e:
+            print(f"⚠️ Could not save run timings: {e}")
+
+def render_backfill_day(target_date, start, end, size_max, settlements):
+    """Worker: rebuild one day's report and cycle archive from its sealed segment or log byte range"""
+    raw_cycles = read_sealed_day(SEGMENTS_DIR, CYCLE_LOG_FILE, target_date) or []
+    if not raw_cycles and end > start:
+        with open_mapped(CYCLE_LOG_FILE) as mm:
+            raw_cycles = scan_cycles_for_date(mm, target_date, start, end)
+    if not raw_cycles:
+        return target_date, 0, [], [], None, {}
+    
+    cycles = [Cycle.from_dict(c) for c in raw_cycles]
+    ctx = make_day_context(target_date, cycles, size_max, settlements)
+    cache = BuildCache()  # Read-only here; the parent merges the returned entries
+    keys = day_keys(ctx)
+    changed = []
+    
+    daily_file = f"daily/{target_date}.md"
+    report = cache.open(daily_file, keys['report'])
+    if report is not None:
+        try:
+            write_daily_report(ctx, report.file)
+            report.file.write(f"\n\n{get_claude_daily_review(ctx)}\n")
+            if report.commit():
+                changed.append(daily_file)
+        except Exception:
+            report.discard()
+            raise
+    
+    cycle_file = f"cycles/{target_date}{ARCHIVE_SUFFIX}"
+    if not cache.fresh(cycle_file, keys['archive']):
+        write_cycle_archive(cycle_file, target_date, ctx.cycles)
+        cache.record(cycle_file, keys['archive'])
+        changed.append(cycle_file)
+    
+    bars_file, bars_changed = save_day_bars(ctx, cache, keys['bars'])
+    if bars_changed:
+        changed.append(bars_file)
+    
+    delta = day_delta(ctx.total_cycles, ctx.signals, ctx.trades, ctx.pnl)
+    entries = {path: cache.entries[path] for path in (daily_file, cycle_file, bars_file) if path in cache.entries}
+    return target_date, ctx.total_cycles, ctx.trades, changed, delta, entries
+
+def backfill(start_date, end_date, workers=None):
+    """Regenerate reports, cycle archives and ledger entries for a date range
+    
+    The log is split into per-day byte ranges in one pass, each day is
+    rendered in a process pool, and everything lands in a single commit.
+    """
+    first = datetime.strptime(start_date, '%Y-%m-%d').date()
+    last = datetime.strptime(end_date, '%Y-%m-%d').date()
+    dates = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+    
+    print(f"🔁 Backfilling {len(dates)} day(s): {start_date} → {end_date}")
+    
+    if not os.path.exists(REPO_PATH):
+        print(f"❌ Repository path not found: {REPO_PATH}")
+        return
+    if not dates or not (os.path.exists(CYCLE_LOG_FILE) or os.path.isdir(SEGMENTS_DIR)):
+        print("❌ Nothing to backfill")
+        return
+    
+    try:
+        os.chdir(REPO_PATH)
+        
+        print("📖 Partitioning cycle log...")
+        if os.path.exists(CYCLE_LOG_FILE):
+            partitions = day_partitions(CYCLE_LOG_FILE, dates)
+        else:
+            partitions = {d: (0, 0) for d in dates}  # Everything is sealed in segments
+        size_max = load_thresholds().get('position_size_max', DEFAULT_POSITION_SIZE_MAX)
+        settlements = load_settlements(SETTLEMENTS_FILE)
+        
+        print("🏭 Rendering days...")
+        rendered = {}
+        cache = BuildCache()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(render_backfill_day, d, *partitions[d], size_max, settlements)
+                for d in dates
+            ]
+            for future in as_completed(futures):
+                target_date, total_cycles, trades, paths, delta, entries = future.result()
+                cache.entries.update(entries)
+                if delta is not None:
+                    rendered[target_date] = (total_cycles, trades, paths, delta)
+                    print(f"   ✅ {target_date}: {total_cycles} cycles, {len(trades)} trades, {len(paths)} file(s) changed")
+        cache.save()
+        
+        if not rendered:
+            print("⚠️ No cycles found in range - nothing to commit")
+            return
+        
+        all_trades = [t for d in sorted(rendered) for t in rendered[d][1]]
+        written = append_trades(all_trades, replace_dates=sorted(rendered))
+        print(f"✅ {written} ledger records appended to {LEDGER_DIR}/")
+        
+        store = load_store(AGGREGATES_FILE)
+        for d in sorted(rendered):
+            apply_day(store, d, rendered[d][3])
+        save_store(AGGREGATES_FILE, store)
+        update_readme_dashboard(REPO_PATH, store)
+        
+        print("📤 Committing to GitHub...")
+        paths = [p for d in sorted(rendered) for p in rendered[d][2]]
+        paths += ledger_paths(all_trades, replace_dates=sorted(rendered)) + [AGGREGATES_FILE, "README.md"]
+        
+        total_cycles = sum(r[0] for r in rendered.values())
+        commit_msg = (f"Backfill {start_date}..{end_date} | Days: {len(rendered)} | "
+                      f"Cycles: {total_cycles} | Trades: {len(all_trades)} | {commit_summary(store)}")
+        if not commit_paths(paths, commit_msg):
+            print("✅ Backfill output unchanged - nothing to commit")
+            return
+        subprocess.run(["git", "push", "origin", "main"], check=True, timeout=PUSH_TIMEOUT)
+        print("✅ Backfill committed and pushed to GitHub")
+        
+    except subprocess.CalledProcessError as e:
+        error_msg = f"Backfill git operation failed: {e}"
+        print(f"❌ {error_msg}")
+        send_error_notification(error_msg)
+    except Exception as e:
+        error_msg = f"Backfill failed: {e}"
+        print(f"❌ {error_msg}")
+        send_error_notification(error_msg)
+
+def publish_live(day, update_dashboard_data, cache, settlements, stores, closing=False):
+    """Republish data.json from the LiveDay's running state with today folded into the all-time store
+    
+    Only trades touched since the last publish are rebuilt and re-settled.
+    The minute-bars shard is rewritten when a new bar opens, and in full
+    when the day is closed out.
+    """
+    trades = day.refresh(settlements.get())
+    store = stores.get()  # Re-read only if the nightly run saved it; today's entry is replaced below
+    apply_day(store, day.date, day.tally.delta(day.total_cycles, day.signals))
+    return update_dashboard_data(day.cycle_data, trades, store, cache=cache, bars=day.bars,
+                                 bars_key=None if closing else day.bars_key)
+
+def follow(debounce=FOLLOW_DEBOUNCE):
+    """Tail the cycle log and republish the dashboard data as cycles arrive
+    
+    Today's cycles are read once at startup; after that only newly appended
+    lines are parsed and folded into the running positions, trades, P/L
+    tally and bars, and data.json is republished at most every `debounce`
+    seconds. The aggregates store is read but never written and the cycle
+    index is not touched - the nightly run still owns both. Settlements and
+    the store are re-read only when their files change.
+    """
+    print(f"👀 Following {CYCLE_LOG_FILE} (publishing at most every {debounce:g}s)")
+    
+    if not os.path.exists(REPO_PATH):
+        print(f"❌ Repository path not found: {REPO_PATH}")
+        return
+    os.chdir(REPO_PATH)
+    sys.path.append(REPO_PATH)
+    from update_dashboard_with_data import update_dashboard_data
+    
+    size_max = load_thresholds().get('position_size_max', DEFAULT_POSITION_SIZE_MAX)
+    cache = BuildCache()
+    settlements = SettlementCache(SETTLEMENTS_FILE)
+    stores = StoreCache(AGGREGATES_FILE)
+    day = LiveDay(date.today().isoformat(), PositionBook(size_max))
+    
+    offset = 0
+    if os.path.exists(CYCLE_LOG_FILE):
+        with open_mapped(CYCLE_LOG_FILE) as mm:
+            if mm is not None:
+                offset = mm.rfind(b'\n') + 1
+                for raw in scan_cycles_for_date(mm, day.date, 0, offset):
+                    day.add(Cycle.from_dict(raw))
+    print(f"📖 {day.total_cycles} cycles already logged today")
+    
+    tailer = LogTailer(CYCLE_LOG_FILE, offset)
+    dirty = True
+    last_publish = 0.0
+    try:
+        while True:
+            for line in tailer.read_lines():
+                try:
+                    cycle = Cycle.from_dict(json.loads(line))
+                except ValueError:
+                    continue
+                cycle_date = cycle.timestamp[:10]
+                if cycle_date < day.date:
+                    continue  # Straggler from before midnight
+                if cycle_date > day.date:
+                    publish_live(day, update_dashboard_data, cache, settlements, stores, closing=True)  # Close out the previous day
+                    day = LiveDay(cycle_date, PositionBook(size_max))
+                if day.add(cycle):
+                    dirty = True
+            
+            now = time.monotonic()
+            if dirty and now - last_publish >= debounce:
+                publish_live(day, update_dashboard_data, cache, settlements, stores)
+                cache.save()
+                dirty = False
+                last_publish = now
+            tailer.wait(max(0.1, debounce - (now - last_publish)) if dirty else debounce)
+    except KeyboardInterrupt:
+        print("👋 Stopped following")
+    finally:
+        tailer.close()
 
 def send_error_notification(error_msg):
     """Send error notification to Kevin"""
     try:
-        subprocess.run([
-            'clawdbot', 'message', 'send',
-            '--channel', 'whatsapp', 
-            '--to', '+12318186017',
-            '--message', f"🚨 **GitHub Nightly Update Failed**\n\n{error_msg}\n\nCheck logs for details."
-        ])
+        subprocess.run(whatsapp_command(
+            f"🚨 **GitHub Nightly Update Failed**\n\n{error_msg}\n\nCheck logs for details."
+        ), timeout=NOTIFY_TIMEOUT)
     except:
         pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Nightly GitHub update for the BTC trading journal")
+    parser.add_argument('--from', dest='from_date', help='Backfill start date (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='to_date', help='Backfill end date (YYYY-MM-DD, default: yesterday)')
+    parser.add_argument('--workers', type=int, help='Backfill worker processes (default: CPU count)')
+    parser.add_argument('--follow', action='store_true', help='Tail the cycle log and keep data.json live')
+    parser.add_argument('--debounce', type=float, default=FOLLOW_DEBOUNCE,
+                        help=f'Seconds between republishes with --follow (default {FOLLOW_DEBOUNCE:g})')
+    parser.add_argument('--trace-memory', action='store_true', help='Record Python heap peaks per stage (tracemalloc)')
+    args = parser.parse_args()
+    
+    if args.follow:
+        follow(args.debounce)
+    elif args.from_date:
+        backfill(args.from_date, args.to_date or (date.today() - timedelta(days=1)).isoformat(), args.workers)
+    else:
+        main(trace_memory=args.trace_memory)
\ No newline at end of file
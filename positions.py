@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Position aggregation engine
+Folds repeated BUY signals on one market window into a single position
+"""
+
+DEFAULT_POSITION_SIZE_MAX = 5.0
+FILL_SIZE = 1.0  # Contracts per BUY signal
+
+class Position:
+    """Consecutive same-side BUY signals on one market_ticker/close_time"""
+    __slots__ = (
+        'market_ticker', 'close_time', 'side', 'signals', 'fills', 'size',
+        'cost_cents', 'first', 'last'
+    )
+
+    def __init__(self, cycle):
+        self.market_ticker = cycle.market_ticker
+        self.close_time = cycle.close_time
+        self.side = cycle.side
+        self.signals = 0
+        self.fills = 0
+        self.size = 0.0
+        self.cost_cents = 0.0
+        self.first = cycle
+        self.last = cycle
+
+    def add(self, cycle, size_max):
+        """Record one signal; it fills only while the position is under size_max"""
+        self.signals += 1
+        self.last = cycle
+        fill = min(FILL_SIZE, size_max - self.size)
+        if fill > 0:
+            self.fills += 1
+            self.size += fill
+            self.cost_cents += fill * cycle.entry_cents
+
+    @property
+    def vwap_cents(self):
+        return self.cost_cents / self.size if self.size else 0.0
+
+    @property
+    def vwap(self):
+        """Volume-weighted average entry price in dollars"""
+        return round(self.vwap_cents / 100, 4)
+
+    def __repr__(self):
+        return f"Position({self.market_ticker} {self.side} x{self.signals} @ {self.vwap})"
+
+class PositionBook:
+    """Incremental form of fold_positions: feed cycles one at a time in O(1) each"""
+
+    def __init__(self, size_max=DEFAULT_POSITION_SIZE_MAX):
+        self.size_max = size_max
+        self.positions = []
+        self.open_positions = {}
+
+    def add(self, cycle):
+        """Fold one cycle in; returns the position it joined, or None for a non-BUY"""
+        if not cycle.is_buy:
+            return None
+        key = (cycle.market_ticker, cycle.close_time)
+        position = self.open_positions.get(key)
+        if position is None or position.side != cycle.side:
+            position = self.open_positions[key] = Position(cycle)
+            self.positions.append(position)
+        position.add(cycle, self.size_max)
+        return position
+
+def fold_positions(cycles, size_max=DEFAULT_POSITION_SIZE_MAX):
+    """Fold a time-ordered cycle stream into positions
+
+    A position stays open per (market_ticker, close_time) until a BUY on the
+    opposite side arrives, which opens a new one. SKIP cycles in between do
+    not break it. Positions are returned in order of their first signal.
+    """
+    book = PositionBook(size_max)
+    for cycle in cycles:
+        book.add(cycle)
+    return book.positions
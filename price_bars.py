@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Per-ticker OHLC bars downsampled from cycle snapshots (analytics/bars/{date}.bars)
+1-minute and 15-minute-window bars of the YES ask with spread and overround, held in typed arrays
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from array import array
+
+from build_cache import atomic_write
+
+MAGIC = b'KBAR1\n'
+BARS_DIR = "analytics/bars"  # Relative to REPO_PATH, like AGGREGATES_FILE
+BARS_SUFFIX = ".bars"
+MINUTE = 60
+WINDOW = 900  # Kalshi 15-minute markets; windows align to unix multiples of 900s
+PERIODS = (MINUTE, WINDOW)
+
+# Column name -> array typecode; prices are integer cents
+COLUMNS = (
+    ('ticker', 'H'),  # Code into BarSeries.tickers
+    ('start', 'q'),  # Bucket start, unix seconds
+    ('open', 'h'), ('high', 'h'), ('low', 'h'), ('close', 'h'),  # YES ask
+    ('ticks', 'I'),  # Snapshots folded into the bar
+    ('spread_sum', 'i'),  # Sum of yes_ask - yes_bid
+    ('overround_sum', 'i'),  # Sum of yes_ask + no_ask - 100
+)
+
+class BarSeries:
+    """OHLC bars of one period for every ticker; add() is O(1) per snapshot"""
+
+    def __init__(self, period):
+        self.period = period
+        self.tickers = []
+        self._ticker_codes = {}
+        self._rows = {}  # (ticker code, bucket start) -> row
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.start)
+
+    def _code(self, ticker):
+        code = self._ticker_codes.get(ticker)
+        if code is None:
+            code = self._ticker_codes[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return code
+
+    def add(self, cycle):
+        """Fold one Cycle snapshot into its ticker's bar"""
+        code = self._code(cycle.market_ticker)
+        start = cycle.unix_time - cycle.unix_time % self.period
+        price = cycle.yes_ask
+        spread = cycle.yes_ask - cycle.yes_bid
+        overround = cycle.yes_ask + cycle.no_ask - 100
+        row = self._rows.get((code, start))
+        if row is None:
+            self._rows[(code, start)] = len(self.start)
+            self.ticker.append(code)
+            self.start.append(start)
+            self.open.append(price)
+            self.high.append(price)
+            self.low.append(price)
+            self.close.append(price)
+            self.ticks.append(1)
+            self.spread_sum.append(spread)
+            self.overround_sum.append(overround)
+            return
+        if price > self.high[row]:
+            self.high[row] = price
+        if price < self.low[row]:
+            self.low[row] = price
+        self.close[row] = price
+        self.ticks[row] += 1
+        self.spread_sum[row] += spread
+        self.overround_sum[row] += overround
+
+    def to_columns(self):
+        """JSON-able columns with per-bar mean spread/overround (cents)"""
+        return {
+            "period": self.period,
+            "tickers": self.tickers,
+            "ticker": self.ticker.tolist(),
+            "t": self.start.tolist(),
+            "o": self.open.tolist(),
+            "h": self.high.tolist(),
+            "l": self.low.tolist(),
+            "c": self.close.tolist(),
+            "n": self.ticks.tolist(),
+            "spread": [round(s / n, 2) for s, n in zip(self.spread_sum, self.ticks)],
+            "overround": [round(o / n, 2) for o, n in zip(self.overround_sum, self.ticks)],
+        }
+
+class DayBars:
+    """Minute and window bars for one day"""
+
+    def __init__(self, target_date):
+        self.date = target_date
+        self.series = {period: BarSeries(period) for period in PERIODS}
+
+    @classmethod
+    def from_cycles(cls, target_date, cycles):
+        bars = cls(target_date)
+        for cycle in cycles:
+            bars.add(cycle)
+        return bars
+
+    @property
+    def minutes(self):
+        return self.series[MINUTE]
+
+    @property
+    def windows(self):
+        return self.series[WINDOW]
+
+    def add(self, cycle):
+        for series in self.series.values():
+            series.add(cycle)
+
+    def to_bytes(self):
+        """MAGIC, u32 header length, JSON header, then each column's raw array bytes"""
+        header = {"date": self.date, "byteorder": sys.byteorder, "series": {}}
+        blobs = []
+        offset = 0
+        for period, series in self.series.items():
+            columns = {}
+            for name, typecode in COLUMNS:
+                blob = getattr(series, name).tobytes()
+                columns[name] = {"typecode": typecode, "offset": offset, "length": len(blob)}
+                blobs.append(blob)
+                offset += len(blob)
+            header['series'][str(period)] = {"tickers": series.tickers, "rows": len(series), "columns": columns}
+        header_bytes = json.dumps(header, separators=(',', ':')).encode()
+        return MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(blobs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a bars file")
+        (header_len,) = struct.unpack_from('<I', data, len(MAGIC))
+        base = len(MAGIC) + 4
+        header = json.loads(data[base:base + header_len])
+        base += header_len
+
+        bars = cls(header['date'])
+        for period, meta in header['series'].items():
+            series = bars.series[int(period)] = BarSeries(int(period))
+            for ticker in meta['tickers']:
+                series._code(ticker)
+            for name, column in meta['columns'].items():
+                values = array(column['typecode'])
+                values.frombytes(data[base + column['offset']:base + column['offset'] + column['length']])
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()
+                setattr(series, name, values)
+            series._rows = {key: row for row, key in enumerate(zip(series.ticker, series.start))}
+        return bars
+
+    def save(self, bars_dir=BARS_DIR):
+        """Atomically write {bars_dir}/{date}.bars; returns (path, changed)"""
+        path = bars_path(bars_dir, self.date)
+        return path, atomic_write(path, self.to_bytes())
+
+def bars_path(bars_dir, target_date):
+    return os.path.join(bars_dir, f"{target_date}{BARS_SUFFIX}")
+
+def load_day_bars(bars_dir, target_date):
+    """DayBars for an archived day, or None if there is no bars file"""
+    try:
+        with open(bars_path(bars_dir, target_date), 'rb') as f:
+            return DayBars.from_bytes(f.read())
+    except OSError:
+        return None
+
+def series_name(ticker):
+    """'KXBTC15M-26FEB100745-45' -> 'KXBTC15M'"""
+    return ticker.split('-', 1)[0]
+
+def market_conditions(bars):
+    """Per-series window statistics: {series: {windows, ticks, avg_range, avg_spread, avg_overround}}
+
+    Averages are in cents; avg_range is the mean high-low of the YES ask per window.
+    """
+    windows = bars.windows
+    stats = {}
+    for row in range(len(windows)):
+        entry = stats.setdefault(series_name(windows.tickers[windows.ticker[row]]), {
+            "windows": 0, "ticks": 0, "range_sum": 0, "spread_sum": 0, "overround_sum": 0
+        })
+        entry['windows'] += 1
+        entry['ticks'] += windows.ticks[row]
+        entry['range_sum'] += windows.high[row] - windows.low[row]
+        entry['spread_sum'] += windows.spread_sum[row]
+        entry['overround_sum'] += windows.overround_sum[row]
+    return {
+        name: {
+            "windows": entry['windows'],
+            "ticks": entry['ticks'],
+            "avg_range": round(entry['range_sum'] / entry['windows'], 2),
+            "avg_spread": round(entry['spread_sum'] / entry['ticks'], 2),
+            "avg_overround": round(entry['overround_sum'] / entry['ticks'], 2),
+        }
+        for name, entry in sorted(stats.items())
+    }
+
+def main():
+    """Print one day's market conditions from its bars file"""
+    parser = argparse.ArgumentParser(description="Price bar summary for one day")
+    parser.add_argument('date', help='YYYY-MM-DD')
+    parser.add_argument('--bars-dir', default=BARS_DIR)
+    args = parser.parse_args()
+
+    bars = load_day_bars(args.bars_dir, args.date)
+    if bars is None:
+        print(f"❌ No bars for {args.date} in {args.bars_dir}/")
+        return
+    print(f"{len(bars.minutes)} minute bars, {len(bars.windows)} window bars")
+    for name, stats in market_conditions(bars).items():
+        print(f"{name:10s} {stats['windows']:4d} windows  range {stats['avg_range']:5.1f}¢  "
+              f"spread {stats['avg_spread']:4.1f}¢  overround {stats['avg_overround']:+5.1f}¢")
+
+if __name__ == "__main__":
+    main()
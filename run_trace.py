@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Lightweight per-stage tracing for the nightly run
+Records wall/CPU time, peak RSS, I/O bytes and stage counters into runs/YYYY-MM.jsonl
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Optional: not available on Windows
+    resource = None
+
+RUNS_DIR = "runs"
+PROC_IO = "/proc/self/io"
+
+def _proc_io():
+    """(bytes read, bytes written) through read()/write() so far, or None off Linux"""
+    try:
+        with open(PROC_IO, 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+
+def _child_cpu():
+    """CPU seconds used by finished subprocesses (git, clawdbot)"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class Span:
+    """Measurements for one stage; counters are filled in by the stage itself"""
+    __slots__ = ('name', 'wall', 'cpu', 'child_cpu', 'peak_rss_kb', 'py_peak_kb',
+                 'io_read', 'io_written', 'counters', 'error')
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+        self.peak_rss_kb = None
+        self.py_peak_kb = None
+        self.io_read = None
+        self.io_written = None
+        self.counters = {}
+        self.error = None
+
+    def count(self, **counters):
+        """Add stage counters such as lines=..., bytes_written=..."""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        record = {
+            "name": self.name,
+            "wall_s": round(self.wall, 4),
+            "cpu_s": round(self.cpu, 4),
+            "child_cpu_s": round(self.child_cpu, 4),
+            "peak_rss_kb": self.peak_rss_kb,
+            "py_peak_kb": self.py_peak_kb,
+            "io_read": self.io_read,
+            "io_written": self.io_written,
+        }
+        record.update(self.counters)
+        if self.error:
+            record['error'] = self.error
+        return record
+
+class RunTrace:
+    """Collects spans for one run; trace_memory=True also tracks Python heap peaks"""
+
+    def __init__(self, run_date, kind='nightly', trace_memory=False):
+        self.run_date = run_date
+        self.kind = kind
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.spans = []
+        self.extra = {}
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name):
+        """Time a stage; the yielded Span takes counters via span.count()"""
+        span = Span(name)
+        io_before = _proc_io()
+        child_before = _child_cpu()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield span
+        except Exception as e:
+            span.error = str(e)
+            raise
+        finally:
+            span.wall = time.perf_counter() - wall_start
+            span.cpu = time.process_time() - cpu_start
+            span.child_cpu = _child_cpu() - child_before
+            span.peak_rss_kb = _peak_rss_kb()
+            if self.trace_memory:
+                span.py_peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+            io_after = _proc_io()
+            if io_before and io_after:
+                span.io_read = io_after[0] - io_before[0]
+                span.io_written = io_after[1] - io_before[1]
+            self.spans.append(span)
+
+    def record(self, **fields):
+        """Attach run-level results (e.g. side-effect outcomes) to the saved record"""
+        self.extra.update(fields)
+
+    def to_dict(self):
+        record = {
+            "kind": self.kind,
+            "date": self.run_date,
+            "started_at": self.started_at.isoformat(),
+            "total_wall_s": round(time.perf_counter() - self._started, 4),
+            "peak_rss_kb": _peak_rss_kb(),
+            "spans": [span.to_dict() for span in self.spans]
+        }
+        record.update(self.extra)
+        return record
+
+    def save(self, runs_dir=RUNS_DIR):
+        """Append this run to runs/YYYY-MM.jsonl; returns the path"""
+        os.makedirs(runs_dir, exist_ok=True)
+        path = os.path.join(runs_dir, f"{self.run_date[:7]}.jsonl")
+        with open(path, 'a') as f:
+            f.write(json.dumps(self.to_dict(), separators=(',', ':')) + "\n")
+        return path
+
+    def summary_markdown(self):
+        """Compact stage table for the end of the daily report"""
+        lines = [
+            "## ⏱️ Run Timing",
+            "",
+            "| Stage | Wall | CPU | Peak RSS | I/O read | I/O written |",
+            "|-------|------|-----|----------|----------|-------------|",
+        ]
+        for span in self.spans:
+            rss = f"{span.peak_rss_kb / 1024:.0f} MB" if span.peak_rss_kb else "--"
+            lines.append(
+                f"| {span.name} | {span.wall:.2f}s | {span.cpu + span.child_cpu:.2f}s | {rss} | "
+                f"{_format_bytes(span.io_read)} | {_format_bytes(span.io_written)} |"
+            )
+        lines.append("")
+        lines.append(f"*Full per-stage history: {RUNS_DIR}/{self.run_date[:7]}.jsonl*")
+        return "\n".join(lines)
+
+def _format_bytes(value):
+    if value is None:
+        return "--"
+    for unit in ('B', 'KB', 'MB'):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
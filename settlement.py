@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Settlement and P/L engine
+Joins trades against a local settlement table and computes P/L per trade, edge and day
+"""
+
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:  # Optional: falls back to plain Python loops
+    np = None
+
+EDGE_TYPES = ('late_window_lock', 'speed_advantage', 'volatility_mispricing', 'unknown')
+
+def load_settlements(settlements_file):
+    """Settlement table {(market_ticker, close_time): 'yes'|'no'}
+
+    The file is JSONL with one {"market_ticker", "close_time", "result"} row
+    per settled market window; later rows win.
+    """
+    settlements = {}
+    if not settlements_file or not os.path.exists(settlements_file):
+        return settlements
+    with open(settlements_file, 'r') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            result = (row.get('result') or '').lower()
+            if result in ('yes', 'no'):
+                settlements[(row.get('market_ticker'), row.get('close_time'))] = result
+    return settlements
+
+class SettlementCache:
+    """load_settlements() for long-running callers; the file is re-read only when its mtime or size changes"""
+
+    def __init__(self, settlements_file):
+        self.settlements_file = settlements_file
+        self._stat = ()  # Never matches a real stat, so the first get() loads
+
+    def get(self):
+        try:
+            st = os.stat(self.settlements_file)
+            stat = (st.st_mtime_ns, st.st_size)
+        except (OSError, TypeError):
+            stat = None
+        if stat != self._stat:
+            self._table = load_settlements(self.settlements_file)
+            self._stat = stat
+        return self._table
+
+def settle_trades(trades, settlements):
+    """Fill market_result and pnl on each trade in place; returns trades
+
+    A trade of `size` contracts bought at `price_paid` pays size * (1 - price)
+    when its side wins and loses size * price otherwise. Unsettled trades keep
+    market_result 'pending' and pnl None.
+    """
+    if not trades:
+        return trades
+
+    results = []
+    for trade in trades:
+        result = settlements.get((trade.get('market_ticker'), trade.get('close_time')))
+        if result is None and trade.get('market_result') in ('yes', 'no'):
+            result = trade['market_result']  # Outcome already logged by the bot
+        results.append(result or 'pending')
+
+    if np is not None:
+        result_arr = np.array(results)
+        side = np.array([t.get('side', '') for t in trades])
+        price = np.array([t.get('price_paid', 0) for t in trades], dtype=float)
+        size = np.array([t.get('size', 1) for t in trades], dtype=float)
+        settled = result_arr != 'pending'
+        won = settled & (result_arr == side)
+        pnl = np.where(won, size * (1 - price), -size * price).round(4)
+        pnl_values = [float(v) if s else None for v, s in zip(pnl, settled)]
+    else:
+        pnl_values = []
+        for trade, result in zip(trades, results):
+            if result == 'pending':
+                pnl_values.append(None)
+                continue
+            price = trade.get('price_paid', 0)
+            size = trade.get('size', 1)
+            won = result == trade.get('side')
+            pnl_values.append(round(size * (1 - price) if won else -size * price, 4))
+
+    for trade, result, pnl in zip(trades, results, pnl_values):
+        trade['market_result'] = result
+        trade['pnl'] = pnl
+    return trades
+
+def _empty_edge():
+    return {"trades": 0, "wins": 0, "losses": 0, "pending": 0, "pnl": 0.0, "win_rate": 0.0}
+
+def summarize(trades):
+    """Day-level P/L summary with a per-edge breakdown
+
+    Win rate is wins over settled trades; pending trades count as neither.
+    """
+    summary = {
+        "trades": len(trades), "wins": 0, "losses": 0, "pending": 0,
+        "win_rate": 0.0, "total_pnl": 0.0, "best_trade": 0.0, "worst_trade": 0.0,
+        "by_edge": {edge: _empty_edge() for edge in EDGE_TYPES}
+    }
+    if not trades:
+        return summary
+
+    edges = [t.get('edge_type', 'unknown') for t in trades]
+    for edge in edges:
+        summary['by_edge'].setdefault(edge, _empty_edge())
+    edge_names = list(summary['by_edge'])
+
+    if np is not None:
+        pnl = np.array([t['pnl'] if t.get('pnl') is not None else np.nan for t in trades], dtype=float)
+        result = np.array([t.get('market_result', 'pending') for t in trades])
+        side = np.array([t.get('side', '') for t in trades])
+        settled = ~np.isnan(pnl)
+        wins = settled & (result == side)
+        losses = settled & ~wins
+        codes = np.array([edge_names.index(e) for e in edges])
+        n = len(edge_names)
+        per_edge = {
+            "trades": np.bincount(codes, minlength=n),
+            "wins": np.bincount(codes, weights=wins, minlength=n),
+            "losses": np.bincount(codes, weights=losses, minlength=n),
+            "pending": np.bincount(codes, weights=~settled, minlength=n),
+            "pnl": np.bincount(codes, weights=np.where(settled, pnl, 0.0), minlength=n),
+        }
+        for i, edge in enumerate(edge_names):
+            stats = summary['by_edge'][edge]
+            for key, column in per_edge.items():
+                stats[key] = round(float(column[i]), 4) if key == 'pnl' else int(column[i])
+
+        summary['wins'] = int(wins.sum())
+        summary['losses'] = int(losses.sum())
+        summary['pending'] = int((~settled).sum())
+        if settled.any():
+            summary['total_pnl'] = round(float(pnl[settled].sum()), 4)
+            summary['best_trade'] = round(float(pnl[settled].max()), 4)
+            summary['worst_trade'] = round(float(pnl[settled].min()), 4)
+    else:
+        settled_pnl = []
+        for trade, edge in zip(trades, edges):
+            stats = summary['by_edge'][edge]
+            stats['trades'] += 1
+            pnl = trade.get('pnl')
+            if pnl is None:
+                stats['pending'] += 1
+                summary['pending'] += 1
+                continue
+            settled_pnl.append(pnl)
+            key = 'wins' if trade.get('market_result') == trade.get('side') else 'losses'
+            stats[key] += 1
+            summary[key] += 1
+            stats['pnl'] = round(stats['pnl'] + pnl, 4)
+        if settled_pnl:
+            summary['total_pnl'] = round(sum(settled_pnl), 4)
+            summary['best_trade'] = max(settled_pnl)
+            summary['worst_trade'] = min(settled_pnl)
+
+    settled_count = summary['wins'] + summary['losses']
+    summary['win_rate'] = (summary['wins'] / settled_count * 100) if settled_count else 0.0
+    for stats in summary['by_edge'].values():
+        edge_settled = stats['wins'] + stats['losses']
+        stats['win_rate'] = (stats['wins'] / edge_settled * 100) if edge_settled else 0.0
+    return summary
+
+def format_pnl(value):
+    """+$1.23 / -$0.45 / $0.00"""
+    if not value:
+        return "$0.00"
+    return f"{'+' if value > 0 else '-'}${abs(value):.2f}"
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Concurrent post-commit side effects (git push, WhatsApp delivery)
+Each command runs under its own timeout with bounded retries; outcomes are returned for the run log
+"""
+
+import asyncio
+import os
+import signal
+import time
+
+class SideEffect:
+    """One external command to run after the nightly commit"""
+    __slots__ = ('name', 'args', 'timeout', 'retries', 'backoff')
+
+    def __init__(self, name, args, timeout=60, retries=2, backoff=5.0):
+        self.name = name
+        self.args = list(args)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff  # Seconds before the first retry, doubled each time
+
+def _tail(data, limit=500):
+    return data.decode(errors='replace').strip()[-limit:] if data else ''
+
+def _kill_group(process):
+    """Kill the command and anything it spawned (ssh, git hooks) holding its pipes open"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        process.kill()
+
+async def _attempt(effect):
+    """Run the command once; returns (returncode, stdout, stderr), raising on timeout"""
+    process = await asyncio.create_subprocess_exec(
+        *effect.args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        start_new_session=True
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), effect.timeout)
+    except asyncio.TimeoutError:
+        _kill_group(process)
+        await process.wait()
+        raise
+    return process.returncode, stdout, stderr
+
+async def run_effect(effect):
+    """Run one side effect with retries; never raises"""
+    started = time.perf_counter()
+    outcome = {"name": effect.name, "ok": False, "attempts": 0, "returncode": None, "error": None}
+    delay = effect.backoff
+    for attempt in range(1, effect.retries + 2):
+        outcome['attempts'] = attempt
+        try:
+            returncode, stdout, stderr = await _attempt(effect)
+            outcome['returncode'] = returncode
+            if returncode == 0:
+                outcome['ok'] = True
+                outcome['error'] = None
+                break
+            outcome['error'] = _tail(stderr) or _tail(stdout) or f"exit status {returncode}"
+        except asyncio.TimeoutError:
+            outcome['error'] = f"timed out after {effect.timeout}s"
+        except OSError as e:
+            outcome['error'] = str(e)
+            break  # Missing binary; retrying will not help
+        if attempt <= effect.retries:
+            await asyncio.sleep(delay)
+            delay *= 2
+    outcome['elapsed_s'] = round(time.perf_counter() - started, 3)
+    return outcome
+
+async def _run_all(effects):
+    return await asyncio.gather(*(run_effect(effect) for effect in effects))
+
+def run_side_effects(effects):
+    """Run side effects concurrently; returns one outcome dict per effect, in order"""
+    return list(asyncio.run(_run_all(effects)))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Synthetic btc_cycle_log.jsonl generator
+Writes bot-shaped cycle records for benchmarks: several 15-minute series, 5-30s cadence
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytz
+
+eastern = pytz.timezone('US/Eastern')
+
+SERIES = ('KXBTC15M', 'KXETH15M', 'KXSOL15M')
+CADENCE_SECONDS = (5, 30)
+DEFAULT_BUY_RATIO = 0.05
+CHEAP_THRESHOLD_CENTS = 35
+WINDOW_MINUTES = 15
+
+def _window_close(local_ts):
+    """Next 15-minute boundary after a bot-local timestamp"""
+    floored = local_ts.replace(minute=local_ts.minute - local_ts.minute % WINDOW_MINUTES, second=0, microsecond=0)
+    return floored + timedelta(minutes=WINDOW_MINUTES)
+
+def _skip_reasoning(rng, yes_ask, no_ask, minutes_left):
+    choice = rng.random()
+    if choice < 0.35:
+        return f"No mathematical edges detected - {minutes_left:.1f}m left, YES {yes_ask}/NO {no_ask}"
+    if choice < 0.6:
+        return f"Both sides expensive - YES: ${yes_ask / 100:.4f}, NO: ${no_ask / 100:.4f}"
+    if choice < 0.85:
+        trend = 'bullish (YES' if yes_ask >= 50 else 'bearish (NO'
+        return (f"LOW CONFIDENCE ({rng.randint(30, 64)}% < 65% threshold) - need higher conviction for smart trading"
+                f" | Factors: Multi-TF Momentum: Mixed/weak signals - 1h:{rng.uniform(-1, 1):.2f}%, bullish TFs:"
+                f"{rng.randint(0, 3)}, bearish TFs:{rng.randint(0, 3)}, Sentiment: Market {trend}: {max(yes_ask, no_ask)}%)")
+    return "Already traded this market cycle"
+
+def iter_synthetic_cycles(start_date, buy_ratio=DEFAULT_BUY_RATIO, cadence=CADENCE_SECONDS,
+                          series=SERIES, seed=0):
+    """Endless stream of cycle records from 00:00 ET on start_date
+
+    Each bot tick (cadence seconds apart) analyses every series once. YES
+    prices random-walk within a market window and reset when it rolls over;
+    a fraction buy_ratio of cycles are BUY signals on the cheaper side.
+    """
+    rng = random.Random(seed)
+    unix_now = eastern.localize(datetime.strptime(start_date, '%Y-%m-%d')).timestamp()
+    mids = {name: 50 for name in series}
+    windows = {}
+    while True:
+        unix_now += rng.uniform(*cadence)
+        local_ts = datetime.fromtimestamp(unix_now, eastern).replace(tzinfo=None)
+        close = _window_close(local_ts)
+        minutes_left = (close - local_ts).total_seconds() / 60
+        for name in series:
+            if windows.get(name) != close:
+                windows[name] = close
+                mids[name] = rng.randint(30, 70)
+            mids[name] = min(99, max(1, mids[name] + rng.randint(-3, 3)))
+            yes_ask = min(100, mids[name] + 1)
+            no_ask = min(100, 100 - mids[name] + 1)
+            yes_bid = max(0, yes_ask - 2)
+            no_bid = max(0, no_ask - 2)
+
+            if rng.random() < buy_ratio:
+                side, price = ('YES', yes_ask) if yes_ask <= no_ask else ('NO', no_ask)
+                decision = f"BUY_{side}"
+                reasoning = f"{side} cheap at ${price / 100:.4f} (threshold: ${CHEAP_THRESHOLD_CENTS / 100:.2f})"
+            else:
+                decision = "SKIP"
+                reasoning = _skip_reasoning(rng, yes_ask, no_ask, minutes_left)
+
+            ticker = f"{name}-{close.strftime('%y%b%d%H%M').upper()}-{close.minute:02d}"
+            close_utc = eastern.localize(close).astimezone(pytz.utc)
+            yield {
+                "timestamp": local_ts.isoformat(),
+                "unix_time": int(unix_now),
+                "market_ticker": ticker,
+                "market_title": f"{name[2:5]} price up in next 15 mins?",
+                "yes_ask": f"{yes_ask / 100:.4f}",
+                "no_ask": f"{no_ask / 100:.4f}",
+                "yes_bid": f"{yes_bid / 100:.4f}",
+                "no_bid": f"{no_bid / 100:.4f}",
+                "time_remaining": minutes_left,
+                "decision": decision,
+                "reasoning": reasoning,
+                "close_time": close_utc.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "outcome": None,
+                "would_profit": None,
+                "cycle_id": f"{ticker}_{int(unix_now)}"
+            }
+
+def write_synthetic_log(path, start_date, days=None, max_bytes=None, **options):
+    """Write records from start_date for `days` ET days and/or up to max_bytes
+
+    Returns (last_date, lines) where last_date is the ET date of the final record.
+    """
+    end_date = None
+    if days is not None:
+        end_date = (datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+    written = 0
+    lines = 0
+    last_date = start_date
+    with open(path, 'w') as f:
+        for record in iter_synthetic_cycles(start_date, **options):
+            record_date = record['timestamp'][:10]
+            if end_date is not None and record_date >= end_date:
+                break
+            line = json.dumps(record) + "\n"
+            f.write(line)
+            written += len(line)
+            lines += 1
+            last_date = record_date
+            if max_bytes is not None and written >= max_bytes:
+                break
+    return last_date, lines
+
+def main():
+    """Write a synthetic log from the command line"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic btc_cycle_log.jsonl")
+    parser.add_argument('path')
+    parser.add_argument('--days', type=int, default=1)
+    parser.add_argument('--end', default=datetime.now(eastern).strftime('%Y-%m-%d'),
+                        help='Last ET day in the log (default: today)')
+    parser.add_argument('--buy-ratio', type=float, default=DEFAULT_BUY_RATIO)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = (datetime.strptime(args.end, '%Y-%m-%d') - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    last_date, lines = write_synthetic_log(args.path, start, days=args.days,
+                                           buy_ratio=args.buy_ratio, seed=args.seed)
+    print(f"✅ {lines} cycles written to {args.path} ({start} to {last_date})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+--follow's running LiveDay state against a full rebuild of the same cycles
+Run with: python3 -m pytest -q test_live_day.py (or python3 -m unittest test_live_day)
+"""
+
+import random
+import unittest
+from itertools import islice
+
+from aggregates import day_delta
+from cycle_record import Cycle
+from nightly_github_update import LiveDay, position_trades
+from positions import PositionBook, fold_positions
+from settlement import settle_trades, summarize
+from synthetic_cycles import iter_synthetic_cycles
+
+DAY = "2026-10-12"
+
+def settle_half(cycles, seed=1):
+    """Settlement table for roughly half of the market windows the cycles touch"""
+    rng = random.Random(seed)
+    windows = sorted({(c.market_ticker, c.close_time) for c in cycles})
+    return {window: rng.choice(('yes', 'no')) for window in windows if rng.random() < 0.5}
+
+class LiveDayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cycles = [Cycle.from_dict(raw) for raw in islice(iter_synthetic_cycles(DAY, buy_ratio=0.2), 3000)]
+        for n, cycle in enumerate(self.cycles):
+            if cycle.is_buy and n % 3 == 0:
+                # Tagged edges and stated confidences, so every RunningDelta counter is exercised
+                cycle.reasoning = f"[LATE_WINDOW_LOCK] Cheap side locked in ({60 + n % 40}% < 70% threshold)"
+
+    def rebuilt(self, cycles, settlements):
+        trades = settle_trades(position_trades(DAY, fold_positions(cycles)), settlements)
+        signals = sum(1 for c in cycles if c.is_buy)
+        return trades, day_delta(len(cycles), signals, trades, summarize(trades))
+
+    def test_refreshing_in_batches_matches_a_full_rebuild(self):
+        settlements = settle_half(self.cycles)
+        day = LiveDay(DAY, PositionBook())
+        for start in range(0, len(self.cycles), 250):
+            for cycle in self.cycles[start:start + 250]:
+                day.add(cycle)
+            day.refresh(settlements)
+
+            trades, delta = self.rebuilt(self.cycles[:start + 250], settlements)
+            self.assertEqual(day.trades, trades)
+            self.assertEqual(day.tally.delta(day.total_cycles, day.signals), delta)
+
+    def test_new_settlement_table_resettles_untouched_trades(self):
+        day = LiveDay(DAY, PositionBook())
+        for cycle in self.cycles:
+            day.add(cycle)
+        day.refresh({})
+
+        settlements = settle_half(self.cycles)
+        day.refresh(settlements)
+
+        trades, delta = self.rebuilt(self.cycles, settlements)
+        self.assertEqual(day.trades, trades)
+        self.assertEqual(day.tally.delta(day.total_cycles, day.signals), delta)
+
+if __name__ == "__main__":
+    unittest.main()
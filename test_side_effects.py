@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Side effects against a throwaway bare git remote and a stub clawdbot on PATH
+Run with: python3 -m pytest -q test_side_effects.py (or python3 -m unittest test_side_effects)
+"""
+
+import os
+import stat
+import subprocess
+import tempfile
+import unittest
+
+from side_effects import SideEffect, run_side_effects
+
+GIT = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+
+class SideEffectsTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.remote = os.path.join(self.root, "remote.git")
+        self.repo = os.path.join(self.root, "repo")
+        subprocess.run(["git", "init", "-q", "--bare", self.remote], check=True)
+        subprocess.run(["git", "init", "-q", "-b", "main", self.repo], check=True)
+        with open(os.path.join(self.repo, "README.md"), 'w') as f:
+            f.write("journal\n")
+        subprocess.run(GIT + ["-C", self.repo, "add", "README.md"], check=True)
+        subprocess.run(GIT + ["-C", self.repo, "commit", "-q", "-m", "Daily update"], check=True)
+        subprocess.run(["git", "-C", self.repo, "remote", "add", "origin", self.remote], check=True)
+
+        self.bin = os.path.join(self.root, "bin")
+        os.makedirs(self.bin)
+        self._path = os.environ['PATH']
+        os.environ['PATH'] = f"{self.bin}{os.pathsep}{self._path}"
+
+    def tearDown(self):
+        os.environ['PATH'] = self._path
+        self._tmp.cleanup()
+
+    def stub_clawdbot(self, body):
+        path = os.path.join(self.bin, "clawdbot")
+        with open(path, 'w') as f:
+            f.write(f"#!/bin/sh\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+
+    def push(self):
+        return SideEffect("git push", ["git", "-C", self.repo, "push", "-q", "origin", "main"], timeout=30, retries=0)
+
+    def remote_head(self):
+        return subprocess.run(["git", "-C", self.remote, "rev-parse", "main"],
+                              capture_output=True, text=True).stdout.strip()
+
+    def local_head(self):
+        return subprocess.run(["git", "-C", self.repo, "rev-parse", "HEAD"],
+                              capture_output=True, text=True).stdout.strip()
+
+    def test_push_and_message_both_succeed(self):
+        self.stub_clawdbot("echo sent")
+        push, message = run_side_effects([self.push(), SideEffect("whatsapp", ["clawdbot", "message", "send"])])
+
+        self.assertTrue(push['ok'], push['error'])
+        self.assertTrue(message['ok'], message['error'])
+        self.assertEqual(message['attempts'], 1)
+        self.assertEqual(self.remote_head(), self.local_head())
+
+    def test_hung_message_times_out_without_blocking_push(self):
+        self.stub_clawdbot("sleep 30")
+        push, message = run_side_effects([
+            self.push(),
+            SideEffect("whatsapp", ["clawdbot", "message", "send"], timeout=0.5, retries=1, backoff=0.1),
+        ])
+
+        self.assertFalse(message['ok'])
+        self.assertEqual(message['attempts'], 2)
+        self.assertIn("timed out", message['error'])
+        self.assertLess(message['elapsed_s'], 10)  # The stub's sleep was killed, not waited out
+        self.assertTrue(push['ok'], push['error'])
+        self.assertEqual(self.remote_head(), self.local_head())
+
+    def test_failing_message_is_isolated_from_push(self):
+        self.stub_clawdbot("echo 'gateway down' >&2; exit 3")
+        message, push = run_side_effects([
+            SideEffect("whatsapp", ["clawdbot", "message", "send"], retries=2, backoff=0.05),
+            self.push(),
+        ])
+
+        self.assertFalse(message['ok'])
+        self.assertEqual(message['attempts'], 3)
+        self.assertEqual(message['returncode'], 3)
+        self.assertEqual(message['error'], "gateway down")
+        self.assertTrue(push['ok'], push['error'])
+
+    def test_failing_push_is_isolated_from_message(self):
+        self.stub_clawdbot("echo sent")
+        subprocess.run(["git", "-C", self.repo, "remote", "set-url", "origin", os.path.join(self.root, "missing.git")],
+                       check=True)
+        push, message = run_side_effects([self.push(), SideEffect("whatsapp", ["clawdbot", "message", "send"])])
+
+        self.assertFalse(push['ok'])
+        self.assertTrue(push['error'])
+        self.assertTrue(message['ok'], message['error'])
+
+    def test_missing_binary_is_not_retried(self):
+        (outcome,) = run_side_effects([SideEffect("whatsapp", ["clawdbot-missing"], retries=3, backoff=0.05)])
+
+        self.assertFalse(outcome['ok'])
+        self.assertEqual(outcome['attempts'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Trade ledger postings when a trade id is re-appended
+Run with: python3 -m pytest -q test_trade_ledger.py (or python3 -m unittest test_trade_ledger)
+"""
+
+import tempfile
+import unittest
+
+from trade_ledger import append_trades, find_trades, get_trade, load_index, rebuild_index
+
+def trade(trade_id, ticker, side='yes'):
+    return {"trade_id": trade_id, "date": "2026-02-10", "market_ticker": ticker, "side": side}
+
+class TradeLedgerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ledger_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_reappended_trade_leaves_its_old_ticker(self):
+        append_trades([trade("20260210001", "KXETH15M-26FEB100745-45"),
+                       trade("20260210002", "KXSOL15M-26FEB100745-45")], self.ledger_dir)
+        append_trades([trade("20260210001", "KXBTC15M-26FEB100745-45")], self.ledger_dir)
+
+        self.assertEqual(find_trades(self.ledger_dir, ticker="KXETH15M-26FEB100745-45"), [])
+        moved = find_trades(self.ledger_dir, ticker="KXBTC15M-26FEB100745-45")
+        self.assertEqual([t['trade_id'] for t in moved], ["20260210001"])
+        self.assertEqual(get_trade("20260210001", self.ledger_dir)['market_ticker'], "KXBTC15M-26FEB100745-45")
+        self.assertEqual([t['trade_id'] for t in find_trades(self.ledger_dir, trade_date="2026-02-10")],
+                         ["20260210001", "20260210002"])
+
+    def test_rebuilt_index_matches_incremental_index(self):
+        append_trades([trade("20260210001", "KXETH15M-26FEB100745-45")], self.ledger_dir)
+        append_trades([trade("20260210001", "KXSOL15M-26FEB100745-45", side='no')], self.ledger_dir)
+        append_trades([], self.ledger_dir, replace_dates=["2026-02-10"])
+
+        self.assertEqual(rebuild_index(self.ledger_dir, "2026-02"), load_index(self.ledger_dir, "2026-02"))
+        self.assertEqual(find_trades(self.ledger_dir, ticker="KXSOL15M-26FEB100745-45"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Append-only trade ledger (trades/ledger/YYYY-MM.jsonl) with a sidecar index
+Replaces one trades/trade_{id}.json per trade; per-trade JSON is exported on demand
+"""
+
+import argparse
+import glob
+import json
+import os
+
+from build_cache import atomic_write
+
+LEDGER_DIR = "trades/ledger"
+
+def _partition(trade):
+    """Monthly partition key (YYYY-MM) for a trade"""
+    return (trade.get('date') or trade.get('timestamp') or '')[:7] or 'unknown'
+
+def _paths(ledger_dir, partition):
+    return (
+        os.path.join(ledger_dir, f"{partition}.jsonl"),
+        os.path.join(ledger_dir, f"{partition}.index.json"),
+    )
+
+def _empty_index():
+    return {"trade_id": {}, "ticker": {}, "date": {}}
+
+def load_index(ledger_dir, partition):
+    """Sidecar index for one partition: trade_id -> [offset, length], ticker/date -> [trade_ids]"""
+    _, index_path = _paths(ledger_dir, partition)
+    try:
+        with open(index_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return rebuild_index(ledger_dir, partition)
+
+def _save_index(ledger_dir, partition, index):
+    _, index_path = _paths(ledger_dir, partition)
+    atomic_write(index_path, json.dumps(index, separators=(',', ':')))
+
+def _index_trade(index, trade, offset, length):
+    trade_id = trade['trade_id']
+    if trade_id in index['trade_id']:
+        _unindex_trade(index, trade_id)  # A newer copy may have moved ticker or date
+    if trade.get('deleted'):
+        return
+    index['trade_id'][trade_id] = [offset, length]
+    for key, value in (('ticker', trade.get('market_ticker')), ('date', trade.get('date'))):
+        ids = index[key].setdefault(value or '', [])
+        if trade_id not in ids:
+            ids.append(trade_id)
+
+def _unindex_trade(index, trade_id):
+    index['trade_id'].pop(trade_id, None)
+    for key in ('ticker', 'date'):
+        for value, ids in list(index[key].items()):
+            if trade_id in ids:
+                ids.remove(trade_id)
+                if not ids:
+                    del index[key][value]
+
+def rebuild_index(ledger_dir, partition):
+    """Recreate a partition's index by scanning its ledger (later records win)"""
+    ledger_path, _ = _paths(ledger_dir, partition)
+    index = _empty_index()
+    if not os.path.exists(ledger_path):
+        return index
+    offset = 0
+    with open(ledger_path, 'rb') as f:
+        for line in f:
+            if line.endswith(b'\n'):
+                try:
+                    _index_trade(index, json.loads(line), offset, len(line))
+                except (ValueError, KeyError):
+                    pass
+            offset += len(line)
+    return index
+
+def append_trades(trades, ledger_dir=LEDGER_DIR, replace_dates=()):
+    """Append trades to their monthly ledgers; returns the number of records written
+
+    Trades whose stored record is byte-identical are skipped, so re-running a
+    night is idempotent. A changed trade (e.g. once settled) is appended again
+    and the index is repointed at the newest copy. For each date in
+    replace_dates (a re-report), previously indexed trades of that date that
+    are not in `trades` get a tombstone record.
+    """
+    os.makedirs(ledger_dir, exist_ok=True)
+    by_partition = {}
+    for trade in trades:
+        by_partition.setdefault(_partition(trade), []).append(trade)
+
+    new_ids = set(trade['trade_id'] for trade in trades)
+    for replace_date in replace_dates:
+        partition = replace_date[:7]
+        stale = [
+            trade_id for trade_id in load_index(ledger_dir, partition)['date'].get(replace_date, [])
+            if trade_id not in new_ids
+        ]
+        for trade_id in stale:
+            by_partition.setdefault(partition, []).append(
+                {"trade_id": trade_id, "date": replace_date, "deleted": True}
+            )
+
+    written = 0
+    for partition, partition_trades in by_partition.items():
+        ledger_path, _ = _paths(ledger_dir, partition)
+        index = load_index(ledger_dir, partition)
+        offset = os.path.getsize(ledger_path) if os.path.exists(ledger_path) else 0
+
+        with open(ledger_path, 'ab') as ledger:
+            for trade in partition_trades:
+                line = (json.dumps(trade, separators=(',', ':')) + "\n").encode()
+                existing = index['trade_id'].get(trade['trade_id'])
+                if trade.get('deleted') and existing is None:
+                    continue
+                if existing and existing[1] == len(line) and _read_at(ledger_path, *existing) == line:
+                    continue
+                ledger.write(line)
+                ledger.flush()
+                _index_trade(index, trade, offset, len(line))
+                offset += len(line)
+                written += 1
+
+        _save_index(ledger_dir, partition, index)
+    return written
+
+def _read_at(ledger_path, offset, length):
+    with open(ledger_path, 'rb') as f:
+        f.seek(offset)
+        return f.read(length)
+
+def ledger_paths(trades, ledger_dir=LEDGER_DIR, replace_dates=()):
+    """Ledger and index files append_trades may touch for these trades"""
+    parts = set(_partition(trade) for trade in trades) | set(d[:7] for d in replace_dates)
+    return [path for partition in sorted(parts) for path in _paths(ledger_dir, partition)]
+
+def partitions(ledger_dir=LEDGER_DIR):
+    """Sorted monthly partitions present in the ledger"""
+    return sorted(
+        os.path.basename(path)[:-len('.jsonl')]
+        for path in glob.glob(os.path.join(ledger_dir, '*.jsonl'))
+    )
+
+def get_trade(trade_id, ledger_dir=LEDGER_DIR):
+    """Fetch one trade by id with a single seek (None if unknown)"""
+    partition = f"{trade_id[:4]}-{trade_id[4:6]}"  # trade ids start with YYYYMMDD
+    entry = load_index(ledger_dir, partition)['trade_id'].get(trade_id)
+    if entry is None:
+        return None
+    ledger_path, _ = _paths(ledger_dir, partition)
+    return json.loads(_read_at(ledger_path, *entry))
+
+def find_trades(ledger_dir=LEDGER_DIR, ticker=None, trade_date=None):
+    """Trades matching a ticker and/or date, resolved through the index"""
+    parts = [trade_date[:7]] if trade_date else partitions(ledger_dir)
+    results = []
+    for partition in parts:
+        index = load_index(ledger_dir, partition)
+        ids = None
+        if ticker is not None:
+            ids = list(index['ticker'].get(ticker, []))
+        if trade_date is not None:
+            date_ids = set(index['date'].get(trade_date, []))
+            ids = sorted(date_ids) if ids is None else [i for i in ids if i in date_ids]
+        if ids is None:
+            ids = list(index['trade_id'])
+
+        ledger_path, _ = _paths(ledger_dir, partition)
+        if not ids or not os.path.exists(ledger_path):
+            continue
+        with open(ledger_path, 'rb') as f:
+            for trade_id in sorted(ids):
+                offset, length = index['trade_id'][trade_id]
+                f.seek(offset)
+                results.append(json.loads(f.read(length)))
+    return results
+
+def export_trade_files(trades, out_dir="trades"):
+    """Materialize per-trade JSON files (trade_{id}.json) for the website"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for trade in trades:
+        path = os.path.join(out_dir, f"trade_{trade['trade_id']}.json")
+        with open(path, 'w') as f:
+            json.dump(trade, f, indent=2)
+        paths.append(path)
+    return paths
+
+def import_legacy_trade_files(trades_dir="trades", ledger_dir=LEDGER_DIR):
+    """Load existing trades/trade_*.json files into the ledger"""
+    trades = []
+    for path in sorted(glob.glob(os.path.join(trades_dir, 'trade_*.json'))):
+        with open(path, 'r') as f:
+            trades.append(json.load(f))
+    return append_trades(trades, ledger_dir)
+
+def main():
+    """Command line access to the ledger"""
+    parser = argparse.ArgumentParser(description="Trade ledger tools")
+    parser.add_argument('--ledger-dir', default=LEDGER_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help='Write per-trade JSON files')
+    export.add_argument('trade_ids', nargs='*')
+    export.add_argument('--date', help='Export every trade from YYYY-MM-DD')
+    export.add_argument('--ticker', help='Export every trade on a market ticker')
+    export.add_argument('--out', default='trades')
+
+    show = sub.add_parser('show', help='Print trades as JSON')
+    show.add_argument('trade_ids', nargs='*')
+    show.add_argument('--date')
+    show.add_argument('--ticker')
+
+    sub.add_parser('import-legacy', help='Ingest existing trades/trade_*.json files')
+
+    args = parser.parse_args()
+
+    if args.command == 'import-legacy':
+        written = import_legacy_trade_files(ledger_dir=args.ledger_dir)
+        print(f"✅ {written} legacy trades added to the ledger")
+        return
+
+    if args.trade_ids:
+        trades = [t for t in (get_trade(i, args.ledger_dir) for i in args.trade_ids) if t]
+    else:
+        trades = find_trades(args.ledger_dir, ticker=args.ticker, trade_date=args.date)
+
+    if args.command == 'export':
+        paths = export_trade_files(trades, args.out)
+        print(f"✅ {len(paths)} trade files exported to {args.out}/")
+    else:
+        print(json.dumps(trades, indent=2))
+
+if __name__ == "__main__":
+    main()
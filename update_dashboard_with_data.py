@@ -1,134 +1,161 @@
 #!/usr/bin/env python3
 """
-Update existing dashboard HTML with real data
-Simpler approach - just update the data sections
+Publish dashboard data for the static website
+Writes data.json (headline numbers), data/days/{date}.json shards and data/bars/{date}.json price bars; index.html fetches them
 """
 
 import json
 import os
-import re
 from datetime import datetime, date
 
-def update_dashboard_data(cycle_data, trades):
-    """Update the existing HTML dashboard with real data"""
-    
-    # Read current HTML file
-    html_path = "/home/ubuntu/clawd/kalshi-btc-trading/index.html"
-    if not os.path.exists(html_path):
-        print("❌ Dashboard HTML file not found")
-        return False
-    
-    with open(html_path, 'r') as f:
-        html_content = f.read()
+from aggregates import EDGE_ROWS, apply_day, day_delta, edge_rows, headline, load_store
+from build_cache import atomic_write, fingerprint
+from settlement import format_pnl, summarize
+
+SITE_PATH = "/home/ubuntu/clawd/kalshi-btc-trading"
+DATA_FILE = "data.json"
+DAY_SHARD_DIR = "data/days"
+BARS_SHARD_DIR = "data/bars"
+EDGE_IDS = {
+    'late_window_lock': 'lateWindow',
+    'speed_advantage': 'speed',
+    'volatility_mispricing': 'vol',
+}
+SHARD_TRADE_FIELDS = ('trade_id', 'timestamp', 'market_ticker', 'edge_type', 'side',
+                      'price_paid', 'fills', 'market_result', 'pnl')
+
+def _write_json(path, payload):
+    """Atomic write so the page never fetches a half-written file; True if the bytes changed"""
+    return atomic_write(path, json.dumps(payload, separators=(',', ':')))
+
+def build_dashboard_data(cycle_data, trades, aggregates=None):
+    """Return (data.json payload, day shard payload)
     
-    # Calculate metrics
+    Headline metrics come from the all-time aggregates store when given
+    (constant time), otherwise from today's data alone. Keys of `metrics`
+    and `edges` are the element ids index.html fills in.
+    """
+    target_date = cycle_data.get('date') or date.today().isoformat()
     total_cycles = cycle_data.get('total_cycles', 0)
     total_trades = len(trades)
-    skips = total_cycles - total_trades
+    skips = total_cycles - cycle_data.get('buy_signals', total_trades)
     skip_rate = (skips / total_cycles * 100) if total_cycles > 0 else 0
     
-    # Win/loss calculation (placeholder for now)
-    wins = 0  # Will be calculated when market outcomes are available
-    win_rate = 0
-    
-    # Edge breakdown
-    edge_counts = {'late_window_lock': 0, 'speed_advantage': 0, 'volatility_mispricing': 0, 'unknown': 0}
-    for trade in trades:
-        edge = trade.get('edge_type', 'unknown')
-        if edge in edge_counts:
-            edge_counts[edge] += 1
+    if aggregates is not None:
+        h = headline(aggregates)
+        edges = {edge: row for (edge, _), (_, *row) in zip(EDGE_ROWS, edge_rows(aggregates))}
+    else:
+        # Win/loss and P/L from today's settled trades
+        pnl = summarize(trades)
+        h = {
+            "total_trades": total_trades,
+            "total_cycles": total_cycles,
+            "skip_rate": f"{skip_rate:.1f}%",
+            "win_rate": f"{pnl['win_rate']:.1f}%",
+            "total_pnl": format_pnl(pnl['total_pnl']),
+            "best_trade": format_pnl(pnl['best_trade']),
+            "worst_trade": format_pnl(pnl['worst_trade']),
+        }
+        edges = {
+            edge: (stats['trades'], stats['wins'], stats['losses'], f"{stats['win_rate']:.1f}%", format_pnl(stats['pnl']))
+            for edge, stats in ((edge, pnl['by_edge'][edge]) for edge, _ in EDGE_ROWS)
+        }
     
-    # Update JavaScript data sections
-    js_updates = f"""
-        // Updated with real data at {datetime.now().isoformat()}
-        document.getElementById('lastUpdated').textContent = 'Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S EST")}';
-        document.getElementById('totalTrades').textContent = '{total_trades}';
-        document.getElementById('cyclesMonitored').textContent = '{total_cycles}';
-        document.getElementById('skipRate').textContent = '{skip_rate:.1f}%';
-        document.getElementById('winRate').textContent = '{win_rate:.1f}%';
-        document.getElementById('totalPL').textContent = '$0.00';
-        
-        // Edge performance
-        document.getElementById('lateWindowTrades').textContent = '{edge_counts['late_window_lock']}';
-        document.getElementById('speedTrades').textContent = '{edge_counts['speed_advantage']}';
-        document.getElementById('volTrades').textContent = '{edge_counts['volatility_mispricing']}';
-    """
+    shard_path = f"{DAY_SHARD_DIR}/{target_date}.json"
+    data = {
+        "generated_at": datetime.now().isoformat(),
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S EST"),
+        "metrics": {
+            "totalTrades": h['total_trades'],
+            "cyclesMonitored": h['total_cycles'],
+            "skipRate": h['skip_rate'],
+            "winRate": h['win_rate'],
+            "totalPL": h['total_pnl'],
+            "bestTrade": h['best_trade'],
+            "worstTrade": h['worst_trade'],
+        },
+        "edges": {
+            EDGE_IDS[edge]: {"Trades": row[0], "WinRate": row[3], "PL": row[4]}
+            for edge, row in edges.items()
+        },
+        "latest_day": {
+            "date": target_date,
+            "cycles": total_cycles,
+            "trades": total_trades,
+            "skip_rate": f"{skip_rate:.1f}%",
+            "shard": shard_path,
+        },
+    }
+    shard = {
+        "date": target_date,
+        "cycles": total_cycles,
+        "buy_signals": cycle_data.get('buy_signals', total_trades),
+        "trades": [{key: trade.get(key) for key in SHARD_TRADE_FIELDS if key in trade} for trade in trades],
+    }
+    return data, shard
+
+def update_dashboard_data(cycle_data, trades, aggregates=None, site_path=SITE_PATH, cache=None, bars=None, bars_key=None):
+    """Publish data.json and today's shard; returns the paths whose contents changed (None on failure)
     
-    # Update recent activity section
-    recent_activity = f"""
-        <div style="padding: 15px; background: rgba(255,255,255,0.05); border-radius: 10px; margin-bottom: 15px;">
-            <strong>Today ({date.today().isoformat()})</strong><br>
-            <small>{total_cycles} cycles analyzed • {total_trades} trades executed • {skip_rate:.1f}% skip rate</small>
-        </div>
-        <div style="padding: 15px; background: rgba(255,255,255,0.05); border-radius: 10px;">
-            <strong>System Status</strong><br>
-            <small>✅ BTC Edge Bot operational • ✅ Auto-notifications active • ✅ Nightly commits enabled</small>
-        </div>
+    index.html itself is never rewritten. With a BuildCache, outputs whose
+    inputs are unchanged (ignoring the generated_at stamps) are left alone.
+    Given the day's price_bars.DayBars, the minute bars feeding the price
+    chart are published too; a bars_key stands in for hashing them, and the
+    bars are only serialized when it changes.
     """
     
-    # Replace placeholders in HTML
-    # Update the JavaScript section
-    html_content = re.sub(
-        r"// You'll replace these with real data loading.*?document\.getElementById\('totalPL'\)\.textContent = '\$0\.00';",
-        js_updates.strip(),
-        html_content,
-        flags=re.DOTALL
-    )
-    
-    # Update recent activity
-    html_content = re.sub(
-        r'recentActivityDiv\.innerHTML = `.*?`;',
-        f'recentActivityDiv.innerHTML = `{recent_activity}`;',
-        html_content,
-        flags=re.DOTALL
-    )
+    if not os.path.isdir(site_path):
+        print("❌ Dashboard site directory not found")
+        return None
     
-    # Write updated HTML
-    with open(html_path, 'w') as f:
-        f.write(html_content)
+    data, shard = build_dashboard_data(cycle_data, trades, aggregates)
+    latest = data['latest_day']
+    outputs = [(os.path.join(site_path, latest['shard']), lambda: shard, lambda: fingerprint(shard))]
+    if bars is not None:
+        latest['bars'] = f"{BARS_SHARD_DIR}/{latest['date']}.json"
+        bars_file = os.path.join(site_path, latest['bars'])
+        if bars_key is None:
+            bars_shard = {"date": latest['date'], **bars.minutes.to_columns()}
+            outputs.append((bars_file, lambda: bars_shard, lambda: fingerprint(bars_shard)))
+        else:
+            outputs.append((bars_file, lambda: {"date": latest['date'], **bars.minutes.to_columns()}, lambda: bars_key))
+    outputs.append((os.path.join(site_path, DATA_FILE), lambda: data, lambda: fingerprint(
+        {key: value for key, value in data.items() if key not in ('generated_at', 'last_updated')})))
+    changed = []
+    for path, payload, key in outputs:
+        if cache is None:
+            written = _write_json(path, payload())
+        else:
+            written = cache.build(path, key(), lambda: json.dumps(payload(), separators=(',', ':')))
+        if written:
+            changed.append(path)
     
-    print(f"✅ Dashboard updated with real data: {total_trades} trades, {total_cycles} cycles, {skip_rate:.1f}% skip rate")
-    return True
+    print(f"✅ Dashboard data published: {latest['trades']} trades, {latest['cycles']} cycles, "
+          f"{latest['skip_rate']} skip rate ({len(changed)} file(s) changed)")
+    return changed
 
 def main():
     """Load data and update dashboard"""
+    # Imported here: the nightly script imports this module for update_dashboard_data
+    from nightly_github_update import AGGREGATES_FILE, build_day_context
     try:
-        # Load today's data
+        # Today's cycles, folded into positions, edge-classified and settled exactly as the nightly run does
         today = date.today().isoformat()
+        ctx = build_day_context(today)
         
-        # Load cycle data
-        cycle_file = f"/home/ubuntu/clawd/kalshi-bot/btc_cycle_log.jsonl"
-        cycles = []
-        if os.path.exists(cycle_file):
-            with open(cycle_file, 'r') as f:
-                for line in f:
-                    try:
-                        cycle = json.loads(line.strip())
-                        if cycle.get('timestamp', '')[:10] == today:
-                            cycles.append(cycle)
-                    except:
-                        continue
-        
-        cycle_data = {"total_cycles": len(cycles), "cycles": cycles}
-        
-        # Extract trades from cycles
-        trades = []
-        for cycle in cycles:
-            if cycle.get('decision', '').startswith('BUY_'):
-                trade = {
-                    "edge_type": "unknown",  # Would parse from reasoning
-                    "side": cycle.get('decision', '').replace('BUY_', '').lower(),
-                    "market_result": cycle.get('outcome', 'pending')
-                }
-                trades.append(trade)
+        # All-time headline numbers need the aggregates store; today is folded in memory only (the nightly run owns the file)
+        store = load_store(os.path.join(SITE_PATH, AGGREGATES_FILE))
+        apply_day(store, today, day_delta(ctx.total_cycles, ctx.signals, ctx.trades, ctx.pnl))
         
         # Update dashboard
-        success = update_dashboard_data(cycle_data, trades)
+        changed = update_dashboard_data(ctx.cycle_data, ctx.trades, store, bars=ctx.bars)
         
-        if success:
-            print(f"🌐 Website dashboard updated successfully!")
-        else:
+        if changed is None:
             print("❌ Failed to update dashboard")
+        elif changed:
+            print(f"🌐 Website dashboard updated successfully! ({len(changed)} file(s) changed)")
+        else:
+            print("🌐 Website dashboard unchanged - already up to date")
             
     except Exception as e:
         print(f"❌ Dashboard update error: {e}")